@@ -19,6 +19,9 @@ class AppConfig:
         dt_nascimento (str): The configured date of birth.
         doc_cpf (str): The configured CPF (Brazilian tax ID).
         email_responsavel (str): The configured responsible person's email address.
+        database_profile (str): The SQLite connection profile, see ConnectDB.CONNECTION_PROFILES.
+        database_cache_mb (str): Page cache size in MiB, empty to use the profile value.
+        database_mmap_mb (str): Memory-mapped I/O size in MiB, empty to use the profile value.
 
     Methods:
         __init__(self, db_file=None): Initializes an instance of AppConfig with optional database file path.
@@ -46,5 +49,8 @@ class AppConfig:
         self.fone_contato = ""
         self.email_contato = ""
         self.categoria_par = ""
+        self.database_profile = "performance"
+        self.database_cache_mb = ""
+        self.database_mmap_mb = ""
 
 
@@ -43,6 +43,7 @@ class AppConfigDialog(QtWidgets.QDialog):
         getDtNascimento(self): Gets the configured date of birth.
         getDocCpf(self): Gets the configured CPF (Brazilian tax ID).
         getEmailResponsavel(self): Gets the configured responsible person's email address.
+        getDatabaseProfile(self): Gets the selected database connection profile.
 
     Example:
         # Create an instance of AppConfigDialog
@@ -83,6 +84,16 @@ class AppConfigDialog(QtWidgets.QDialog):
         self.toggleContainer.setLayout(QtWidgets.QVBoxLayout())
         self.toggleContainer.layout().addWidget(self.category_even)        
 
+    def setupProfileSelector(self):
+        """include the database connection profile selector"""
+        self.profileLabel = QtWidgets.QLabel("Perfil do banco:", self)
+        self.profileLabel.setGeometry(10, 383, 125, 20)
+        self.database_profile = QtWidgets.QComboBox(self)
+        self.database_profile.setGeometry(135, 380, 260, 25)
+        self.database_profile.addItem("Desempenho (disco local)", "performance")
+        self.database_profile.addItem("Seguro (pendrive ou rede)", "safe")
+        self.database_profile.addItem("Padrão do SQLite", "legacy")
+
     def setupUi(self):
         """Sets up the user interface elements."""
         uiFile = os.path.join(path.ui, "appConfig.ui")
@@ -91,6 +102,7 @@ class AppConfigDialog(QtWidgets.QDialog):
         self.logo_file = ""
         self.config_manager = AppConfigManager()
         self.setupToggle()
+        self.setupProfileSelector()
 
     def connectSignals(self):
         """Connects signals to their respective slots."""
@@ -190,6 +202,8 @@ class AppConfigDialog(QtWidgets.QDialog):
         self.emailContato.setText(self.app_config.email_contato)
         self.updateLogo(self.app_config.logo_file)
         self.category_even.setChecked(self.app_config.categoria_par == "True")
+        index = self.database_profile.findData(self.app_config.database_profile)
+        self.database_profile.setCurrentIndex(max(index, 0))
 
     def updateLogo(self, file_name):
         """Updates the logo display."""
@@ -223,6 +237,7 @@ class AppConfigDialog(QtWidgets.QDialog):
         self.app_config.email_contato = self.getEmailContato()
         self.app_config.logo_file = self.logo_file
         self.app_config.categoria_par = self.getCategoryType()
+        self.app_config.database_profile = self.getDatabaseProfile()
 
         self.config_manager.saveConfig(self.app_config)
         self.updateUI()
@@ -283,3 +298,6 @@ class AppConfigDialog(QtWidgets.QDialog):
         """Gets the configured category type."""
         return self.category_even.isChecked()
 
+    def getDatabaseProfile(self):
+        """Gets the selected database connection profile."""
+        return self.database_profile.currentData()
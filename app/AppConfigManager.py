@@ -78,6 +78,9 @@ class AppConfigManager:
             app_config.email_contato       = config.get("AppConfig", "email_contato", fallback="")
             app_config.email_contato       = config.get("AppConfig", "email_contato", fallback="")
             app_config.categoria_par       = config.get("AppConfig", "categoria_par", fallback="False")
+            app_config.database_profile    = config.get("AppConfig", "database_profile", fallback="performance")
+            app_config.database_cache_mb   = config.get("AppConfig", "database_cache_mb", fallback="")
+            app_config.database_mmap_mb    = config.get("AppConfig", "database_mmap_mb", fallback="")
 
             return app_config, config_exists
         else:
@@ -115,6 +118,9 @@ class AppConfigManager:
             "fone_contato": config.fone_contato,
             "email_contato": config.email_contato,
             "categoria_par": config.categoria_par,
+            "database_profile": config.database_profile,
+            "database_cache_mb": config.database_cache_mb,
+            "database_mmap_mb": config.database_mmap_mb,
         }
 
         with open(self.config_file, "w") as cfgfile:
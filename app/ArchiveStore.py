@@ -0,0 +1,202 @@
+import os
+import re
+
+class ArchiveStore:
+    """
+    A cold tier for the athletes that no longer play: an archive database next to the
+    main one, attached only when it is used.
+
+    Archiving moves the inactive athletes (is_active = 0), and optionally those born
+    before a given year, with their photo and documents, out of the main database, so
+    that the listings and indexes stay sized to the current season. The archive keeps
+    the athletes table with the same columns plus archived_at, and the attachments
+    stored inline. Archived athletes can be listed and restored.
+
+    Parameters:
+        db (ConnectDB): The database connection object.
+
+    Example:
+    >>> store = ArchiveStore(db)
+    >>> store.archive(born_before=2005)
+    >>> column_names, rows = store.list_summary()
+    >>> store.restore([12])
+    """
+    schema = 'archive'
+    tbAttachments = 'attachments'
+
+    def __init__(self, db):
+        """
+        Initialize the ArchiveStore instance.
+
+        Parameters:
+            db (ConnectDB): The database connection object.
+        """
+        self.db = db
+
+    def file_name(self):
+        """Get the path of the archive database, e.g. athlete.archive.db for athlete.db."""
+        base, ext = os.path.splitext(self.db.db_name)
+        return f"{base}.{self.schema}{ext or '.db'}"
+
+    def exists(self):
+        """Returns True if there is an archive database."""
+        return os.path.exists(self.file_name())
+
+    def attach(self):
+        """
+        Attach the archive database to the connection, creating it if needed.
+
+        Raises:
+            sqlite3.Error: If the archive cannot be opened.
+        """
+        attached = [row[1] for row in self.db.conn.execute("PRAGMA database_list")]
+        if self.schema in attached:
+            return
+        # ATTACH is not allowed inside a transaction
+        self.db.conn.commit()
+        self.db.conn.execute(f"ATTACH DATABASE ? AS {self.schema}", (self.file_name(),))
+        self._create_tables()
+
+    def detach(self):
+        """Detach the archive database, if it is attached."""
+        attached = [row[1] for row in self.db.conn.execute("PRAGMA database_list")]
+        if self.schema in attached:
+            self.db.conn.commit()
+            self.db.conn.execute(f"DETACH DATABASE {self.schema}")
+
+    def _create_tables(self):
+        """Create the archive tables from the schema of the main athletes table."""
+        table = self.db.tbName
+        sql = self.db.conn.execute(
+            "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()[0]
+        sql = re.sub(r'^\s*CREATE\s+TABLE\s+"?%s"?' % re.escape(table),
+                     f'CREATE TABLE IF NOT EXISTS {self.schema}.{table}', sql, count=1, flags=re.IGNORECASE)
+        with self.db.transaction() as conn:
+            conn.execute(sql)
+            columns = [row[1] for row in conn.execute(f"PRAGMA {self.schema}.table_info({table})")]
+            if 'archived_at' not in columns:
+                conn.execute(f"ALTER TABLE {self.schema}.{table} ADD COLUMN archived_at TEXT")
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {self.schema}.{self.tbAttachments} (
+                    athlete_id INTEGER NOT NULL,
+                    kind TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    PRIMARY KEY (athlete_id, kind)
+                )''')
+
+    def archive(self, born_before=None):
+        """
+        Move the inactive athletes, and those born before a year, to the archive.
+
+        The rows are copied to the archive and committed first, then deleted from the
+        main database in a second transaction; the delete triggers drop their attachments
+        and search entries. With the main database in WAL mode a transaction over both
+        files would be atomic per file only, and could lose the athletes in a crash. If
+        the run is interrupted between the two steps the athletes are in both databases,
+        and since the copy replaces existing archive rows it can simply be repeated.
+
+        Parameters:
+            born_before (int, optional): Also archive the athletes born before this year.
+
+        Returns:
+            int: The number of athletes archived.
+
+        Raises:
+            sqlite3.Error: If the archive fails; the athletes not deleted yet are still in the main database.
+
+        Usage:
+        >>> store.archive(born_before=2005)
+        """
+        self.attach()
+        table = self.db.tbName
+        condition = "is_active = 0"
+        parameters = ()
+        if born_before is not None:
+            condition += f" OR {self.db.birth_year_column()} < ?"
+            parameters = (born_before,)
+        columns = ', '.join(['id'] + self.db.keys)
+        store = self.db.attachments
+
+        with self.db.transaction() as conn:
+            conn.execute(f'''
+                INSERT OR REPLACE INTO {self.schema}.{table} ({columns}, archived_at)
+                SELECT {columns}, datetime('now') FROM main.{table} WHERE {condition}''', parameters)
+            conn.execute(f'''
+                INSERT OR REPLACE INTO {self.schema}.{self.tbAttachments} (athlete_id, kind, data)
+                SELECT a.athlete_id, a.kind, b.data
+                FROM main.{store.tbName} a JOIN main.{store.blobTable} b ON b.id = a.blob_id
+                WHERE a.athlete_id IN (SELECT id FROM main.{table} WHERE {condition})''', parameters)
+
+        # Only the athletes that are safely in the archive are deleted
+        with self.db.transaction() as conn:
+            archived = conn.execute(f'''
+                DELETE FROM main.{table}
+                WHERE ({condition}) AND id IN (SELECT id FROM {self.schema}.{table})''', parameters).rowcount
+        return archived
+
+    def list_summary(self, columns=None):
+        """
+        Retrieve the listing columns of the archived athletes, attaching the archive only if it exists.
+
+        Parameters:
+            columns (sequence, optional): The columns to fetch. Defaults to ConnectDB.SUMMARY_COLUMNS.
+
+        Returns:
+            tuple: The list of column names and the list of rows, ordered by name.
+        """
+        column_names = ['id'] + [c for c in (columns or self.db.SUMMARY_COLUMNS) if c != 'id']
+        if not self.exists():
+            return column_names, []
+        self.attach()
+        sql = f"SELECT {', '.join(column_names)} FROM {self.schema}.{self.db.tbName} ORDER BY nome"
+        return column_names, self.db.conn.execute(sql).fetchall()
+
+    def restore(self, ids):
+        """
+        Move archived athletes back to the main database, as active athletes.
+
+        Like archive(), the athletes are copied to the main database and committed before
+        they are deleted from the archive. The athletes already in the main database,
+        left there by an interrupted restore, are not copied again, so a failed restore
+        can simply be repeated.
+
+        Parameters:
+            ids (iterable): The IDs of the archived athletes.
+
+        Returns:
+            int: The number of athletes restored.
+
+        Raises:
+            sqlite3.Error: If the restore fails; the athletes not restored yet are still in the archive.
+        """
+        ids = list(ids)
+        if not ids:
+            return 0
+        self.attach()
+        table = self.db.tbName
+        columns = ', '.join(['id'] + self.db.keys)
+        placeholders = ', '.join('?' * len(ids))
+
+        with self.db.transaction() as conn:
+            copied = [row[0] for row in conn.execute(f'''
+                SELECT id FROM {self.schema}.{table}
+                WHERE id IN ({placeholders}) AND id NOT IN (SELECT id FROM main.{table})''', ids)]
+            if copied:
+                copied_placeholders = ', '.join('?' * len(copied))
+                conn.execute(f'''
+                    INSERT INTO main.{table} ({columns})
+                    SELECT {columns} FROM {self.schema}.{table} WHERE id IN ({copied_placeholders})''', copied)
+                attachments = conn.execute(f'''
+                    SELECT athlete_id, kind, data FROM {self.schema}.{self.tbAttachments}
+                    WHERE athlete_id IN ({copied_placeholders})''', copied).fetchall()
+                for athlete_id, kind, data in attachments:
+                    self.db.attachments.put(athlete_id, kind, bytes(data))
+            conn.execute(f"UPDATE main.{table} SET is_active = 1 WHERE id IN ({placeholders})", ids)
+
+        # Only the athletes that are safely in the main database are deleted
+        with self.db.transaction() as conn:
+            restored = f"id IN ({placeholders}) AND id IN (SELECT id FROM main.{table})"
+            conn.execute(f'''
+                DELETE FROM {self.schema}.{self.tbAttachments}
+                WHERE athlete_id IN (SELECT id FROM {self.schema}.{table} WHERE {restored})''', ids)
+            return conn.execute(f"DELETE FROM {self.schema}.{table} WHERE {restored}", ids).rowcount
@@ -0,0 +1,116 @@
+import sqlite3
+
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTableView, QAbstractItemView, QPushButton, QLabel, QMessageBox
+from PyQt5.QtCore import Qt, QSortFilterProxyModel
+
+from .AthletesTableModel import AthletesTableModel
+
+class ArchivedAthletesDialog(QDialog):
+    """
+    A dialog listing the athletes out of the category tabs: the inactive ones, still
+    in the main database, and the archived ones. The archive database is only read
+    when the dialog is opened.
+
+    The selected athletes can be reactivated; archived ones are restored to the main
+    database first. The reactivated attribute holds the IDs reactivated, so the caller
+    knows whether the tabs must be reloaded.
+
+    Args:
+        db (ConnectDB): The database connection object.
+        parent (QWidget, optional): The parent widget.
+
+    Usage:
+    >>> dialog = ArchivedAthletesDialog(db, self)
+    >>> dialog.exec_()
+    >>> if dialog.reactivated:
+    >>>     self.reload_categories()
+    """
+
+    INACTIVE = 'Inativo'
+    ARCHIVED = 'Arquivado'
+
+    def __init__(self, db, parent=None):
+        """
+        Initialize the ArchivedAthletesDialog.
+
+        Args:
+            db (ConnectDB): The database connection object.
+            parent (QWidget, optional): The parent widget.
+        """
+        super().__init__(parent)
+        self.db = db
+        self.reactivated = []
+
+        self.model = AthletesTableModel(['id', 'situacao'] + list(db.SUMMARY_COLUMNS), parent=self)
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setSortRole(Qt.UserRole)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy_model)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setColumnHidden(0, True)
+
+        self.count_label = QLabel()
+        self.reactivate_button = QPushButton("Reativar")
+        self.reactivate_button.clicked.connect(self.reactivate_selected)
+        self.close_button = QPushButton("Fechar")
+        self.close_button.clicked.connect(self.accept)
+
+        self.init_ui()
+        self.load_rows()
+
+    def init_ui(self):
+        """
+        Initialize the user interface of the dialog.
+        """
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.count_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.reactivate_button)
+        button_layout.addWidget(self.close_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table_view)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        self.setWindowTitle("Atletas Inativos e Arquivados")
+        self.resize(800, 500)
+
+    def load_rows(self):
+        """
+        Read the inactive athletes and the archived ones into the table.
+        """
+        _, inactive = self.db.list_summary(active=False)
+        _, archived = self.db.archive.list_summary()
+        rows = [(row[0], self.INACTIVE) + tuple(row[1:]) for row in inactive]
+        rows += [(row[0], self.ARCHIVED) + tuple(row[1:]) for row in archived]
+        self.model.set_rows(rows)
+        self.table_view.resizeColumnsToContents()
+        self.count_label.setText(f"{len(inactive)} inativo(s), {len(archived)} arquivado(s)")
+
+    def reactivate_selected(self):
+        """
+        Reactivate the selected athletes, restoring the archived ones to the main database.
+        """
+        rows = {self.proxy_model.mapToSource(index).row() for index in self.table_view.selectionModel().selectedRows()}
+        inactive = [self.model.id_at(row) for row in rows if self.model.value(row, 'situacao') == self.INACTIVE]
+        archived = [self.model.id_at(row) for row in rows if self.model.value(row, 'situacao') == self.ARCHIVED]
+        if not inactive and not archived:
+            return
+
+        try:
+            if inactive:
+                self.db.set_athletes_active(inactive, True)
+            if archived:
+                self.db.archive.restore(archived)
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, 'Reativar', f'Erro ao reativar os atletas: {e}')
+            self.load_rows()
+            return
+
+        self.reactivated += inactive + archived
+        self.load_rows()
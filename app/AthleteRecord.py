@@ -0,0 +1,57 @@
+from collections.abc import Mapping
+
+class AthleteRecord(Mapping):
+    """
+    A read-only mapping with the data of one athlete whose attachments are loaded on demand.
+
+    Column values are read together with the record. For the attachments only the
+    available kinds are known up front; their bytes are read from the AttachmentStore
+    the first time the key is accessed and kept for later accesses.
+
+    Parameters:
+        store (AttachmentStore): The store the attachments are read from.
+        athlete_id (int): The ID of the athlete.
+        fields (dict): The column values of the athlete.
+        attachment_kinds (list): The attachment kinds stored for the athlete.
+        converters (dict, optional): Functions applied to an attachment when it is loaded, by kind.
+
+    Example:
+    >>> record = AthleteRecord(db.attachments, 1, {'nome': 'John'}, ['foto', 'rg_pdf'])
+    >>> record['nome']        # no attachment is read
+    'John'
+    >>> record['rg_pdf']      # read from the database now
+    """
+
+    def __init__(self, store, athlete_id, fields, attachment_kinds, converters=None):
+        self.athlete_id = athlete_id
+        self.fields = fields
+        self._store = store
+        self._kinds = list(attachment_kinds)
+        self._converters = converters or {}
+        self._loaded = {}
+
+    def __getitem__(self, key):
+        if key in self.fields:
+            return self.fields[key]
+        if key in self._kinds:
+            if key not in self._loaded:
+                value = self._store.read(self.athlete_id, key)
+                convert = self._converters.get(key)
+                self._loaded[key] = convert(value) if convert and value is not None else value
+            return self._loaded[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        # Checked without loading the attachment
+        return key in self.fields or key in self._kinds
+
+    def __iter__(self):
+        yield from self.fields
+        yield from (kind for kind in self._kinds if kind not in self.fields)
+
+    def __len__(self):
+        return len(self.fields) + len([kind for kind in self._kinds if kind not in self.fields])
+
+    def is_loaded(self, key):
+        """Returns True if the key is a column or an attachment that was already read."""
+        return key in self.fields or key in self._loaded
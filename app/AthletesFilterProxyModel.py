@@ -0,0 +1,36 @@
+from PyQt5.QtCore import QSortFilterProxyModel
+
+class AthletesFilterProxyModel(QSortFilterProxyModel):
+    """
+    A sort proxy that shows only a given set of source rows.
+
+    The rows to show are computed elsewhere (see RowFilterIndex) and applied in one
+    batch with set_accepted_rows, which invalidates the filter once.
+
+    Args:
+        parent (QObject, optional): The parent object.
+
+    Usage:
+    >>> proxy = AthletesFilterProxyModel()
+    >>> proxy.setSourceModel(model)
+    >>> proxy.set_accepted_rows(index.match('maria'))
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._accepted = None
+
+    def set_accepted_rows(self, rows):
+        """
+        Show only some source rows.
+
+        Args:
+            rows (set or None): The source rows to show, or None to show all of them.
+        """
+        if rows == self._accepted:
+            return
+        self._accepted = rows
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._accepted is None or source_row in self._accepted
@@ -0,0 +1,175 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+class AthletesTableModel(QAbstractTableModel):
+    """
+    A table model over the listing rows of the athletes.
+
+    The rows are kept column by column (one Python list per column) and the view only
+    asks for the cells it paints, so no item object is created per cell. An index from
+    athlete id to row keeps updates of a single athlete cheap.
+
+    Args:
+        column_names (list): The names of the columns, 'id' included.
+        rows (list, optional): The initial rows, in the order of column_names.
+        parent (QObject, optional): The parent object.
+
+    Usage:
+    >>> model = AthletesTableModel(['id', 'nome'], [(1, 'John'), (2, 'Jane')])
+    >>> view = QTableView()
+    >>> view.setModel(model)
+    >>> model.upsert((3, 'Alice'))
+    """
+
+    def __init__(self, column_names, rows=(), parent=None):
+        super().__init__(parent)
+        self.column_names = list(column_names)
+        self._id_column = self.column_names.index('id')
+        self._columns = [[] for _ in self.column_names]
+        self._row_of_id = {}
+        self.set_rows(rows)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._columns[self._id_column])
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.column_names)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._columns[index.column()][index.row()]
+        if role == Qt.DisplayRole:
+            return '' if value is None else str(value)
+        if role == Qt.UserRole:
+            # Raw value, used for sorting
+            return '' if value is None else value
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.column_names[section]
+        return str(section + 1)
+
+    def set_rows(self, rows):
+        """
+        Replace all the rows of the model.
+
+        Args:
+            rows (list): The rows, in the order of column_names.
+        """
+        self.beginResetModel()
+        self._columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in self.column_names]
+        self._reindex()
+        self.endResetModel()
+
+    def _reindex(self, start=0):
+        """Rebuild the id to row index from the given row on; from the first row, the whole index."""
+        if start == 0:
+            # Drop the ids of the rows that were replaced or removed
+            self._row_of_id = {}
+        ids = self._columns[self._id_column]
+        for row in range(start, len(ids)):
+            if ids[row] is not None:
+                self._row_of_id[ids[row]] = row
+
+    def row_for_id(self, athlete_id):
+        """
+        Get the row of an athlete.
+
+        Args:
+            athlete_id (int): The id of the athlete.
+
+        Returns:
+            int or None: The row, or None if the athlete is not in the model.
+        """
+        return self._row_of_id.get(athlete_id)
+
+    def id_at(self, row):
+        """Get the athlete id stored in a row."""
+        return self._columns[self._id_column][row]
+
+    def value(self, row, column_name):
+        """Get the raw value of a cell by column name."""
+        return self._columns[self.column_names.index(column_name)][row]
+
+    def row_values(self, row):
+        """Get the raw values of a row, in the order of column_names."""
+        return [column[row] for column in self._columns]
+
+    def column_values(self, column_name):
+        """Get the raw values of a column, in model order."""
+        return list(self._columns[self.column_names.index(column_name)])
+
+    def ids(self):
+        """Get the ids of all the athletes in the model."""
+        return [athlete_id for athlete_id in self._columns[self._id_column] if athlete_id is not None]
+
+    def append_rows(self, rows):
+        """
+        Append rows at the end of the model.
+
+        Args:
+            rows (list): The rows, in the order of column_names.
+        """
+        if not rows:
+            return
+        start = self.rowCount()
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        for row_data in rows:
+            for column, value in zip(self._columns, row_data):
+                column.append(value)
+        self._reindex(start)
+        self.endInsertRows()
+
+    def upsert(self, row_data):
+        """
+        Update the row of an athlete, or append it if the athlete is not in the model.
+
+        Args:
+            row_data (list): The row, in the order of column_names.
+        """
+        row = self.row_for_id(row_data[self._id_column])
+        if row is None:
+            self.append_rows([row_data])
+            return
+        for column, value in zip(self._columns, row_data):
+            column[row] = value
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def remove_rows(self, rows):
+        """
+        Remove rows from the model.
+
+        Args:
+            rows (iterable): The row numbers to remove.
+        """
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            athlete_id = self._columns[self._id_column][row]
+            for column in self._columns:
+                del column[row]
+            self._row_of_id.pop(athlete_id, None)
+            self.endRemoveRows()
+        self._reindex()
+
+    def remove_id(self, athlete_id):
+        """
+        Remove the row of an athlete.
+
+        Args:
+            athlete_id (int): The id of the athlete.
+
+        Returns:
+            bool: True if the row was removed, False if the athlete was not in the model.
+        """
+        row = self.row_for_id(athlete_id)
+        if row is None:
+            return False
+        self.remove_rows([row])
+        return True
@@ -7,13 +7,14 @@ import sqlite3
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QTabWidget, QAction,
     QHBoxLayout, QMessageBox, QFileDialog, QApplication, QSizePolicy, QAbstractItemView,
-    QDialog
+    QDialog, QProgressBar, QComboBox, QInputDialog
 )
 from PyQt5.QtGui import QIcon, QPixmap, QFont
 from PyQt5.QtCore import Qt
 from PyQt5.QtCore import QDate
 from PyQt5.QtCore import QTimer
 from PyQt5.QtCore import QSize
+from PyQt5.QtCore import QThreadPool
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
@@ -22,18 +23,23 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.pdfgen import canvas
 from datetime import datetime
 
-import pandas as pd
-import numpy as np
 
 from .SplashScreen import SplashScreen
 from .DatePickerDialog import DatePickerDialog
 from .AtletasTableWidget import AtletasTableWidget
+from .CategoryPlaceholder import CategoryPlaceholder
+from .BackgroundLoader import BackgroundLoader
 from .PopupWindow import PopupWindow
+from .ArchivedAthletesDialog import ArchivedAthletesDialog
 from .utils import calculate_age_category, age, getCat
+from .CategoryRules import CategoryRules
 from .AppConfigManager import AppConfigManager
 from .AppConfigDialog import AppConfigDialog
 from .cadastro import cadastroDialog
 from .ConnectDB import ConnectDB  # Import the ConnectDB class if it's in a separate file
+from .BulkImport import AthleteImporter
+from .BatchFormGenerator import BatchFormGenerator
+from .RegistrationForm import RegistrationForm
 from .paths import path
 
 
@@ -90,6 +96,7 @@ class AtletasApp(QMainWindow):
         self.create_search_bar()
         self.create_table()
         self.create_buttons()
+        self.create_load_progress()
 
         #load data inside table view
         self.loadData()
@@ -212,15 +219,13 @@ class AtletasApp(QMainWindow):
         self.cadastro = cadastroDialog(self.config, self.db)
         self.cadastro.exec_()
         
-        # Clear tab_widget
-        self.tab_widget.clear()
-
-        # reload data with inserted new data
-        self.loadData()
+        # Add only the new athlete to its category tab
+        if self.cadastro.affected_id is not None:
+            self.refresh_athlete(self.cadastro.affected_id)
 
     def create_db(self):
 
-        self.db = ConnectDB(self.config.app_config.database_file)
+        self.db = ConnectDB.from_config(self.config.app_config)
         self.db.createTable(self.config.app_config.database_table_name)
 
     def create_table(self):
@@ -238,6 +243,13 @@ class AtletasApp(QMainWindow):
         self.tab_widget.setFixedSize(800, 600)
         self.mainLayout.addWidget(self.tab_widget)
 
+        # Category tables are built when their tab is first selected
+        self._materializing = False
+        self.tab_widget.currentChanged.connect(self.materialize_tab)
+
+        # Deletes of tabs removed before they were saved
+        self.pending_deletes = set()
+
     def create_search_bar(self):
         """
         Create the search bar.
@@ -248,13 +260,30 @@ class AtletasApp(QMainWindow):
 
         search_line = QLineEdit(self)
         search_line.setPlaceholderText("Buscar...")
-        search_line.textChanged.connect(self.search_table)
+
+        # Busca só depois de uma pausa na digitação, não a cada tecla
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(lambda: self.search_table(search_line.text()))
+        search_line.textChanged.connect(lambda text: self.search_timer.start())
+        self.search_results = None
 
         # Criar um layout Horizontal
 
+        # Categorias de uma liga com regras próprias (categories.yaml)
+        self.league = None
+        self.league_selector = QComboBox(self)
+        self.league_selector.addItem("Categorias padrão", None)
+        for league in CategoryRules.from_file().league_names():
+            self.league_selector.addItem(league, league)
+        self.league_selector.setVisible(self.league_selector.count() > 1)
+        self.league_selector.currentIndexChanged.connect(self.change_league)
+
         searchLayout = QHBoxLayout()
         #searchLayout.addStretch(1)  # Add stretchable space to push the buttons to the right
         searchLayout.addWidget(search_line)
+        searchLayout.addWidget(self.league_selector)
         searchLayout.addStretch(0)  # Add stretchable space to push the buttons to the right
         searchLayout.addStretch(0)  # Add stretchable space to push the buttons to the right
 
@@ -292,6 +321,27 @@ class AtletasApp(QMainWindow):
         # Definir o layout como layout principal da janela
         self.mainLayout.addLayout(buttonsLayout)
 
+    def create_load_progress(self):
+        """
+        Create the progress indicator of the category tables being loaded.
+
+        A progress bar and a cancel button are shown in the status bar while any
+        BackgroundLoader is running.
+        """
+        self.loaders = {}
+
+        self.load_progress = QProgressBar(self)
+        self.load_progress.setMaximumWidth(200)
+        self.load_progress.setFormat("Carregando %v de %m")
+
+        self.cancel_load_button = QPushButton("Cancelar", self)
+        self.cancel_load_button.clicked.connect(lambda: self.cancel_loading())
+
+        self.statusBar().addPermanentWidget(self.load_progress)
+        self.statusBar().addPermanentWidget(self.cancel_load_button)
+        self.load_progress.hide()
+        self.cancel_load_button.hide()
+
     def create_actions(self):
         """
         Create actions for menu items.
@@ -347,39 +397,149 @@ class AtletasApp(QMainWindow):
         icon = os.path.join(path.icon, 'delete-row-128.ico')
         delete_row.setIcon(QIcon(icon))
 
+        import_action = QAction("Importar Atletas", self)
+        import_action.triggered.connect(self.import_athletes)
+
+        archive_action = QAction("Arquivar Atletas...", self)
+        archive_action.triggered.connect(self.archive_athletes)
+
+        show_archived_action = QAction("Mostrar Inativos e Arquivados", self)
+        show_archived_action.triggered.connect(self.show_archived)
+
         actionConfiguracoes = QAction("Configurações", self)
         actionConfiguracoes.triggered.connect(self.config.openConfigurationDialog)
 
         file_menu.addAction(print_action)
         file_menu.addAction(sort_column)
         file_menu.addAction(delete_row)
+        file_menu.addAction(import_action)
+        file_menu.addSeparator()
+        file_menu.addAction(archive_action)
+        file_menu.addAction(show_archived_action)
+        file_menu.addSeparator()
         file_menu.addAction(actionConfiguracoes)
 
-    def editarDados(self, item):
+    def import_athletes(self):
+        """
+        Import athletes in bulk from a CSV or XLSX file.
+
+        Usage:
+        - Use the "Importar Atletas" option from the menu and choose the roster file.
+        """
+        filename, _ = QFileDialog.getOpenFileName(self, 'Importar Atletas', '', 'Planilhas (*.csv *.xlsx)')
+        if not filename:
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            inserted, errors = AthleteImporter(self.db).import_file(filename)
+        except (ValueError, ImportError, OSError) as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self, 'Importar Atletas', str(e))
+            return
+        QApplication.restoreOverrideCursor()
+
+        # Every category may have changed
+        self.reload_categories()
+
+        message = f'{inserted} atleta(s) importado(s).'
+        if errors:
+            message += '\n\n' + '\n'.join(f'Linha {line}: {error}' for line, error in errors[:20])
+        QMessageBox.information(self, 'Importar Atletas', message)
+
+    def archive_athletes(self):
+        """
+        Move the inactive athletes, and those born before a chosen year, to the archive database.
+
+        Deletions not saved yet are saved first, so the athletes deleted in the tables
+        are archived too.
+
+        Usage:
+        - Use the "Arquivar Atletas..." option from the menu, usually at the start of a season.
+        """
+        born_before, ok = QInputDialog.getInt(
+            self, 'Arquivar Atletas',
+            'Arquivar os atletas inativos e os nascidos antes de:',
+            datetime.now().year - 21, 1900, datetime.now().year + 1)
+        if not ok:
+            return
+
+        self.save_data()
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            archived = self.db.archive.archive(born_before=born_before)
+        except sqlite3.Error as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self, 'Arquivar Atletas', f'Erro ao arquivar os atletas: {e}')
+            return
+        QApplication.restoreOverrideCursor()
+
+        self.reload_categories()
+        if self.search_results is not None and not self.search_results.isHidden():
+            self.search_timer.start()
+        QMessageBox.information(self, 'Arquivar Atletas',
+                                f'{archived} atleta(s) arquivado(s) em {self.db.archive.file_name()}.')
+
+    def show_archived(self):
+        """
+        Show the inactive and archived athletes, which can be reactivated.
+
+        The archive database is only read here, never by the category tabs.
+        """
+        dialog = ArchivedAthletesDialog(self.db, self)
+        dialog.exec_()
+        if dialog.reactivated:
+            self.reload_categories()
+            if self.search_results is not None and not self.search_results.isHidden():
+                self.search_timer.start()
+
+    def generate_registration_forms(self, athlete_ids):
+        """
+        Generate the registration forms of several athletes into one PDF or zip file.
+
+        Parameters:
+            athlete_ids (list): The IDs of the selected athletes.
+
+        Usage:
+        - Use the "Gerar Fichas" button of a category tab and choose the athletes.
+        """
+        filename, _ = QFileDialog.getSaveFileName(self, 'Gerar Fichas', 'fichas.pdf',
+                                                  'PDF (*.pdf);;Arquivo ZIP (*.zip)')
+        if not filename:
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            app_config = self.config.app_config
+            generator = BatchFormGenerator(RegistrationForm.header_from_config(app_config), app_config.logo_file)
+            generator.generate(BatchFormGenerator.records_from_db(self.db, athlete_ids), filename)
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.warning(self, 'Gerar Fichas', str(e))
+            return
+        QApplication.restoreOverrideCursor()
+
+        QMessageBox.information(self, 'Gerar Fichas', f'{len(athlete_ids)} ficha(s) gerada(s) em {filename}.')
+
+    def editarDados(self, id_value):
         """
         Edit athlete data.
 
         This method allows the user to edit athlete data by double-clicking on a cell in the table.
 
         Parameters:
-            item (QTableWidgetItem): The selected table item.
+            id_value (int): The ID of the athlete whose row was double-clicked.
 
         Usage:
         - Double-click on a cell in the table to edit the corresponding athlete's data.
         """
 
-        selected_row = item.row()
-        table_widget = item.tableWidget()
-        id_value = table_widget.item(selected_row, 0).text()  # Obter valor da primeira coluna (id)
-
         self.cadastro = cadastroDialog(self.config, self.db, 'update', id_value)
         self.cadastro.exec_()
         
-        # Clear tab_widget
-        self.tab_widget.clear()
-
-        # reload data with inserted new data
-        self.loadData()
+        # Patch only the edited athlete's row
+        if self.cadastro.affected_id is not None:
+            self.refresh_athlete(self.cadastro.affected_id)
 
 
     def open_date_picker_dialog(self):
@@ -406,79 +566,433 @@ class AtletasApp(QMainWindow):
         - Called automatically when the application starts to load athlete data.
         """
 
-        table_name = self.config.app_config.database_table_name
-        sql_query = f"SELECT * FROM {table_name}"
-        cursor = self.db.conn.cursor()
-        cursor.execute(sql_query)
-        data = cursor.fetchall()
-        column_names = [description[0] for description in cursor.description]
-        df = pd.DataFrame(data,columns=column_names)
-        
-        df['age']=df['dtNascimento'].apply(age)
-        categories = {}
+        # Only the listing columns are fetched, never the attachments
+        self.column_names = ['id'] + list(self.db.SUMMARY_COLUMNS)
+
+        self.create_category_tabs()
+
+    def create_category_tabs(self):
+        """
+        Create one tab per category, replacing the existing tabs.
+
+        Tabs start as placeholders with a count; only the selected one reads its rows.
+        """
+        self.cancel_loading()
+        self._materializing = True
+        try:
+            while self.tab_widget.count():
+                self.remove_category_tab(0)
+            for category, (first_year, last_year, count) in self.category_ranges().items():
+                self.add_category_placeholder(category, count)
+        finally:
+            self._materializing = False
+        self.materialize_tab(self.tab_widget.currentIndex())
+
+    def change_league(self, index):
+        """
+        Group the athletes by the categories of another league.
+
+        Parameters:
+            index (int): The index of the league in the league selector.
+        """
+        self.league = self.league_selector.itemData(index)
+        self.create_category_tabs()
+
+    def category_table(self):
+        """
+        Get the birth year to category table of the selected league.
+
+        Returns:
+            CategoryTable: The table for the current season, compiled once and kept by the rules.
+        """
+        return CategoryRules.from_file().table(self.league, self.config.category_even.isChecked())
+
+    def category_ranges(self):
+        """
+        Get the categories that have athletes, from the athlete count of each birth year.
+
+        Returns:
+            dict: The first birth year, last birth year and athlete count of each category,
+            ordered from the oldest category to the youngest.
+        """
+        counts = self.db.birth_year_counts()
+        names = self.category_table().lookup([birth_year for birth_year, _ in counts])
+        ranges = {}
+        for category, (birth_year, count) in zip(names.tolist(), counts):
+            first_year, last_year, total = ranges.get(category, (birth_year, birth_year, 0))
+            ranges[category] = (min(first_year, birth_year), max(last_year, birth_year), total + count)
+        return ranges
+
+    def category_of(self, row, table=None):
+        """
+        Get the category of an athlete from its listing row.
+
+        Parameters:
+            row (tuple): A row returned by ConnectDB.list_summary.
+            table (CategoryTable, optional): The category table. Defaults to the one of the selected league.
+
+        Returns:
+            str: The category name.
+        """
+        dtNascimento = row[self.column_names.index('dtNascimento')]
+        ano_nascimento = int(dtNascimento[-4:])
+        return (table or self.category_table())[ano_nascimento]
+
+    def add_category_placeholder(self, category, count):
+        """
+        Create the tab of a category without reading its rows.
+
+        Parameters:
+            category (str): The category name.
+            count (int): The number of athletes in the category.
+
+        Returns:
+            CategoryPlaceholder: The placeholder of the new tab.
+        """
+        placeholder = CategoryPlaceholder(category, count)
+        self.tab_widget.addTab(placeholder, category)
+        self.update_tab_badge(placeholder)
+        return placeholder
+
+    def materialize_tab(self, tab_index):
+        """
+        Build the table of a tab the first time it is selected, or reload it if it is stale.
+
+        The table is created empty and its rows are read in the background by load_category.
+
+        Parameters:
+            tab_index (int): The index of the tab.
+        """
+        if tab_index < 0 or self._materializing:
+            return
+
+        widget = self.tab_widget.widget(tab_index)
+        if isinstance(widget, CategoryPlaceholder):
+            self._materializing = True
+            try:
+                table_widget = self.create_category_widget(widget.category_name, [])
+                self.tab_widget.removeTab(tab_index)
+                self.tab_widget.insertTab(tab_index, table_widget, widget.category_name)
+                self.tab_widget.setCurrentIndex(tab_index)
+                widget.deleteLater()
+            finally:
+                self._materializing = False
+            self.load_category(table_widget)
+        elif widget.stale and not widget.loading:
+            widget.populate_table([])
+            widget.stale = False
+            self.load_category(widget)
+
+    def load_category(self, table_widget):
+        """
+        Read the rows of a category table in the background, appending them as they arrive.
 
-        for row in range(len(data)):
-            dtNascimento = data[row][5]  # Supondo que a data de nascimento esteja na quinta coluna
-            ano_nascimento = int(dtNascimento[-4:])
-            categoria = getCat(ano_nascimento, self.config.category_even.isChecked())
+        Parameters:
+            table_widget (AtletasTableWidget): The empty table of the category.
+        """
+        category_range = self.category_ranges().get(table_widget.category_name)
+        if category_range is None:
+            self.update_tab_badge(table_widget)
+            return
+
+        _, sql, parameters = self.db.summary_query(birth_years=category_range[:2])
+        loader = BackgroundLoader(self.db, lambda conn: conn.execute(sql, parameters), total=category_range[2])
+        loader.signals.chunkLoaded.connect(
+            lambda rows, widget=table_widget, loader=loader: self.append_loaded_rows(widget, loader, rows))
+        loader.signals.progress.connect(lambda count: self.update_load_progress())
+        loader.signals.finished.connect(
+            lambda completed, widget=table_widget, loader=loader: self.finish_loading(widget, loader))
+        loader.signals.failed.connect(
+            lambda error, widget=table_widget, loader=loader: self.finish_loading(widget, loader, error))
+
+        table_widget.loading = True
+        self.loaders[table_widget] = loader
+        self.update_tab_badge(table_widget)
+        self.update_load_progress()
+        loader.start()
+
+    def append_loaded_rows(self, table_widget, loader, rows):
+        """
+        Append a chunk of rows read by a BackgroundLoader to its table.
+
+        Parameters:
+            table_widget (AtletasTableWidget): The table being loaded.
+            loader (BackgroundLoader): The loader that read the rows.
+            rows (list): The listing rows.
+        """
+        if self.loaders.get(table_widget) is not loader:
+            # Chunk of a cancelled loader, still queued
+            return
+        # Athletes saved while the table was loading are already in it, deleted ones stay out
+        rows = [row for row in rows
+                if table_widget.find_row(row[0]) is None and row[0] not in table_widget.pending_deletes]
+        table_widget.model.append_rows(rows)
+
+    def finish_loading(self, table_widget, loader, error=None):
+        """
+        Forget a loader once it ended, reporting its error, if any.
+
+        Parameters:
+            table_widget (AtletasTableWidget): The table that was loaded.
+            loader (BackgroundLoader): The loader that ended.
+            error (str, optional): The error that stopped the loader.
+        """
+        if self.loaders.get(table_widget) is not loader:
+            return
+        del self.loaders[table_widget]
+        table_widget.loading = False
+        if error is not None:
+            # Partially loaded, read it again when it is next selected
+            table_widget.stale = True
+            QMessageBox.warning(self, 'Carregar Atletas', f'Erro ao carregar {table_widget.category_name}: {error}')
+        self.update_tab_badge(table_widget)
+        self.update_load_progress()
+
+    def cancel_loading(self, table_widget=None):
+        """
+        Cancel the background loading of a table, or of all the tables.
+
+        The tables left incomplete are marked stale and read again when next selected.
+
+        Parameters:
+            table_widget (AtletasTableWidget, optional): The table. Defaults to all the tables being loaded.
+        """
+        widgets = list(self.loaders) if table_widget is None else [table_widget]
+        for widget in widgets:
+            loader = self.loaders.pop(widget, None)
+            if loader is None:
+                continue
+            loader.cancel()
+            widget.loading = False
+            widget.stale = True
+            self.update_tab_badge(widget, loader.total)
+        self.update_load_progress()
+
+    def update_load_progress(self):
+        """Show the progress of the running loaders in the status bar, hiding it when there are none."""
+        loading = bool(self.loaders)
+        if loading:
+            self.load_progress.setMaximum(max(1, sum(loader.total or 0 for loader in self.loaders.values())))
+            self.load_progress.setValue(sum(loader.loaded for loader in self.loaders.values()))
+        self.load_progress.setVisible(loading)
+        self.cancel_load_button.setVisible(loading)
+
+    def reload_categories(self):
+        """
+        Bring the tabs in line with the database after a bulk change.
+
+        Placeholder counts are refreshed, tabs of categories left without athletes are
+        removed, new categories get a placeholder and the tables already built are
+        marked stale, so each one is read again when it is next selected.
+        """
+        ranges = self.category_ranges()
+        for tab_index in reversed(range(self.tab_widget.count())):
+            widget = self.tab_widget.widget(tab_index)
+            category_range = ranges.get(widget.category_name)
+            if category_range is None:
+                self.cancel_loading(widget)
+                self.remove_category_tab(tab_index)
+            elif isinstance(widget, CategoryPlaceholder):
+                widget.set_count(category_range[2])
+                self.update_tab_badge(widget)
+            else:
+                self.cancel_loading(widget)
+                widget.stale = True
+                self.update_tab_badge(widget, category_range[2])
+
+        for category, (first_year, last_year, count) in ranges.items():
+            if self.find_category_tab(category) is None:
+                self.add_category_placeholder(category, count)
+
+        self.materialize_tab(self.tab_widget.currentIndex())
+
+    def create_category_widget(self, category, category_data):
+        """
+        Create the table widget of a category, without adding it to a tab.
+
+        Parameters:
+            category (str): The category name.
+            category_data (list): The listing rows of the athletes in the category.
+
+        Returns:
+            AtletasTableWidget: The table widget.
+        """
+        table_widget = AtletasTableWidget(category, category_data, self.column_names, db=self.db)
+        table_widget.athleteActivated.connect(self.editarDados)
+        table_widget.registrationFormsRequested.connect(self.generate_registration_forms)
+
+        # Keep the athlete count shown in the tab title up to date
+        model = table_widget.model
+        for signal in (model.rowsInserted, model.rowsRemoved, model.modelReset):
+            signal.connect(lambda *args, widget=table_widget: self.update_tab_badge(widget))
+        return table_widget
+
+    def add_category_tab(self, category, category_data):
+        """
+        Create the tab of a category.
+
+        Parameters:
+            category (str): The category name.
+            category_data (list): The listing rows of the athletes in the category.
+
+        Returns:
+            AtletasTableWidget: The table widget of the new tab.
+        """
+        table_widget = self.create_category_widget(category, category_data)
+        self.tab_widget.addTab(table_widget, category)
+        self.update_tab_badge(table_widget)
+        return table_widget
+
+    def update_tab_badge(self, table_widget, count=None):
+        """
+        Show the number of athletes of a category in its tab title.
+
+        Parameters:
+            table_widget (AtletasTableWidget): The table widget of the tab.
+            count (int, optional): The number of athletes. Defaults to the rows of the table.
+        """
+        tab_index = self.tab_widget.indexOf(table_widget)
+        if tab_index >= 0:
+            count = table_widget.get_row_count() if count is None else count
+            loader = self.loaders.get(table_widget)
+            if loader is not None and loader.total:
+                # Still loading, show how many rows arrived so far
+                count = f"{count}/{loader.total}"
+            self.tab_widget.setTabText(tab_index, f"{table_widget.category_name} ({count})")
+
+    def remove_category_tab(self, tab_index):
+        """
+        Remove a category tab, keeping the deletes of its table that were not saved yet.
+
+        Parameters:
+            tab_index (int): The index of the tab.
+        """
+        widget = self.tab_widget.widget(tab_index)
+        if isinstance(widget, AtletasTableWidget):
+            self.pending_deletes.update(widget.pending_deletes)
+        self.tab_widget.removeTab(tab_index)
+        widget.deleteLater()
+
+    def table_widgets(self):
+        """
+        Get the athlete tables built so far.
+
+        Returns:
+            list: The AtletasTableWidget of every category tab already built, and the search results table.
+        """
+        widgets = [self.tab_widget.widget(i) for i in range(self.tab_widget.count())]
+        widgets = [widget for widget in widgets if isinstance(widget, AtletasTableWidget)]
+        if self.search_results is not None:
+            widgets.append(self.search_results)
+        return widgets
 
-            if categoria not in categories:
-                categories[categoria] = []
+    def current_table(self):
+        """
+        Get the table the user is looking at.
+
+        Returns:
+            AtletasTableWidget or None: The search results when they are shown in place
+            of the tabs, otherwise the table of the current tab, or None if that tab
+            is not built yet.
+        """
+        if self.search_results is not None and not self.search_results.isHidden():
+            return self.search_results
+        current_widget = self.tab_widget.currentWidget()
+        return current_widget if isinstance(current_widget, AtletasTableWidget) else None
+
+    def find_category_tab(self, category):
+        """
+        Find the tab of a category.
+
+        Parameters:
+            category (str): The category name.
 
-            categories[categoria].append(data[row])
+        Returns:
+            AtletasTableWidget, CategoryPlaceholder or None: The widget of the category tab, if it has one.
+        """
+        for tab_index in range(self.tab_widget.count()):
+            table_widget = self.tab_widget.widget(tab_index)
+            if table_widget.category_name == category:
+                return table_widget
+        return None
 
-        for category, category_data in categories.items():
-            table_widget = AtletasTableWidget(category, category_data, column_names)
-            table_widget.table_widget.itemDoubleClicked.connect(self.editarDados)
-            self.tab_widget.addTab(table_widget, category)
+    def refresh_athlete(self, athlete_id):
+        """
+        Update a single athlete in the category tabs after an insert or update.
 
+        The row is patched in place, or moved to another tab if the birth year changed
+        the category. Tabs left empty are removed.
 
-        cursor.close()
+        Parameters:
+            athlete_id (int): The ID of the inserted or updated athlete.
+        """
+        row = self.db.read_summary(athlete_id)
+        category = self.category_of(row) if row is not None else None
+
+        for tab_index in reversed(range(self.tab_widget.count())):
+            table_widget = self.tab_widget.widget(tab_index)
+            if isinstance(table_widget, CategoryPlaceholder):
+                continue
+            if table_widget.category_name != category and table_widget.remove_athlete(athlete_id):
+                if table_widget.get_row_count() == 0 and not table_widget.loading:
+                    self.remove_category_tab(tab_index)
+
+        if row is not None:
+            table_widget = self.find_category_tab(category)
+            if table_widget is None:
+                table_widget = self.add_category_tab(category, [])
+            if not isinstance(table_widget, CategoryPlaceholder):
+                table_widget.upsert_athlete(row)
+
+        self.update_placeholder_counts()
+
+        if self.search_results is not None and not self.search_results.isHidden():
+            self.search_timer.start()
+
+    def update_placeholder_counts(self):
+        """Refresh the counts of the tabs not built yet, removing those left without athletes."""
+        ranges = self.category_ranges()
+        for tab_index in reversed(range(self.tab_widget.count())):
+            placeholder = self.tab_widget.widget(tab_index)
+            if not isinstance(placeholder, CategoryPlaceholder):
+                continue
+            if placeholder.category_name in ranges:
+                placeholder.set_count(ranges[placeholder.category_name][2])
+                self.update_tab_badge(placeholder)
+            else:
+                self.remove_category_tab(tab_index)
 
     def save_data(self):
         """
-        Check for deleted rows in the table and delete them from the database.
-    
-        This method checks if any rows have been deleted in the table and deletes
-        the corresponding rows from the database.
-    
+        Deactivate in the database the athletes deleted in the tables.
+
+        The IDs come from the change journal of each table (pending_deletes), so only
+        the athletes the user deleted are touched, whatever the tables have loaded or
+        filtered. Deleting is a soft delete: is_active is cleared in a single
+        transaction, so the athletes can be reactivated from the archived view until
+        they are archived. They are then removed from the other tables that show them.
+
         Usage:
         - Called when changes to athlete data are made and need to be saved.
         """
-        table_name = self.config.app_config.database_table_name
-        cursor = self.db.conn.cursor()
-    
-        try:
-            cursor.execute("BEGIN TRANSACTION")
-            
-            # Collect the IDs of all rows in the table
-            existing_ids = set()
-            for tab_index in range(self.tab_widget.count()):
-                table_widget = self.tab_widget.widget(tab_index)
-                for row in range(table_widget.table_widget.rowCount()):
-                    item = table_widget.table_widget.item(row, 0)  # Assuming the first column contains unique IDs
-                    if item is not None:
-                        existing_ids.add(int(item.text()))
-    
-            # Get the IDs of rows in the database
-            cursor.execute(f"SELECT id FROM {table_name}")
-            database_ids = set(row[0] for row in cursor.fetchall())
-    
-            # Calculate the IDs of rows that need to be deleted
-            rows_to_delete = database_ids - existing_ids
-    
-            # Delete rows from the database
-            for row_id in rows_to_delete:
-                cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (row_id,))
-    
-            self.db.commit_db()
-        except Exception as e:
-            self.db.conn.rollback()
-            print(f"Error while checking and deleting rows: {str(e)}")
-        finally:
-            cursor.close()
-
+        widgets = self.table_widgets()
+        journals = [self.pending_deletes] + [widget.pending_deletes for widget in widgets]
+        ids = set().union(*journals)
+        if not ids:
+            return
 
+        try:
+            self.db.set_athletes_active(ids, False)
+        except sqlite3.Error as e:
+            print(f"Error while deleting rows: {str(e)}")
+            return
+
+        for journal in journals:
+            journal.clear()
+        for widget in widgets:
+            for athlete_id in ids:
+                widget.remove_athlete(athlete_id)
+        self.update_placeholder_counts()
 
     def closeEvent(self, event):
         """
@@ -498,13 +1012,20 @@ class AtletasApp(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.Cancel)
 
         if reply == QMessageBox.Yes:
+            self.stop_loaders()
             self.save_data()
             event.accept()
         elif reply == QMessageBox.No:
+            self.stop_loaders()
             event.accept()
         else:
             event.ignore()
 
+    def stop_loaders(self):
+        """Cancel the background loaders and wait for their threads to end."""
+        self.cancel_loading()
+        QThreadPool.globalInstance().waitForDone()
+
     def delete_selected_row(self):
         """
         Delete selected rows from the table.
@@ -515,16 +1036,14 @@ class AtletasApp(QMainWindow):
         - Select one or more rows and use the "Deletar Linha" option from the menu to delete them.
         """
 
-        current_widget = self.tab_widget.currentWidget()
-        if current_widget:
-            table_widget = current_widget.table_widget
-            selected_rows = table_widget.selectionModel().selectedRows()
+        current_widget = self.current_table()
+        if current_widget is not None:
+            selected_rows = current_widget.selected_source_rows()
             if len(selected_rows) > 0:
                 reply = QMessageBox.question(self, 'Deletar Linha(s)', 'Deseja realmente deletar a(s) linha(s) selecionada(s)?',
                                              QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
                 if reply == QMessageBox.Yes:
-                    for row in selected_rows:
-                        table_widget.removeRow(row.row())
+                    current_widget.delete_selected_row()
                     self.save_data()
                 else:
                     QMessageBox.information(self, 'Informação', 'Nenhuma linha foi deletada.')
@@ -544,12 +1063,10 @@ class AtletasApp(QMainWindow):
         - Use the "Selecionar Coluna" option from the menu to select a column.
         """
 
-        current_widget = self.tab_widget.currentWidget()
-        if current_widget:
-            table_widget = current_widget.table_widget
-            selected_columns = table_widget.selectionModel().selectedColumns()
-            if len(selected_columns) > 0:
-                column_names = [table_widget.horizontalHeaderItem(col).text() for col in selected_columns]
+        current_widget = self.current_table()
+        if current_widget is not None:
+            column_names = current_widget.selected_column_names()
+            if len(column_names) > 0:
                 reply = QMessageBox.information(self, 'Selecionar Coluna', f'Coluna(s) selecionada(s): {", ".join(column_names)}',
                                                 QMessageBox.Ok)
             else:
@@ -570,11 +1087,11 @@ class AtletasApp(QMainWindow):
         - Use the "Ordenar Coluna" option from the menu to sort a column.
         """
 
-        current_widget = self.tab_widget.currentWidget()
-        if current_widget:
-            selected_column = current_widget.table_widget.currentColumn()
-            if selected_column >= 0:
-                current_widget.table_widget.sortItems(selected_column)
+        current_widget = self.current_table()
+        if current_widget is not None:
+            column_name = current_widget.current_column_name()
+            if column_name is not None:
+                current_widget.sort_table_by_column(column_name)
         else:
             QMessageBox.warning(self, 'Aviso', 'Nenhuma tabela selecionada.')
 
@@ -582,29 +1099,67 @@ class AtletasApp(QMainWindow):
         """
         Search for text in the table.
 
-        This method allows the user to search for text in the table and filter the displayed records.
+        The athletes of all the categories are searched in the full-text index and
+        shown in a results table in place of the tabs, until the search is cleared.
+        Without a full-text index, the current tab is filtered instead.
 
         Parameters:
             text (str): The text to search for.
 
         Usage:
-        - Enter text in the search bar to filter the table records.
+        - Enter text in the search bar to find athletes by name, nickname, guardian,
+          registration number, CPF, RG or city.
+        """
+        if not self.db.search_index.available():
+            current_widget = self.tab_widget.currentWidget()
+            if isinstance(current_widget, AtletasTableWidget):
+                current_widget.filter_table(text)
+            else:
+                QMessageBox.warning(self, 'Aviso', 'Nenhuma tabela selecionada.')
+            return
+
+        if not text.strip():
+            if self.search_results is not None:
+                self.search_results.hide()
+            self.tab_widget.show()
+            self.statusBar().clearMessage()
+            return
+
+        _, rows = self.db.search_index.search(text)
+        if self.search_results is None:
+            self.create_search_results()
+        self.search_results.populate_table(self.with_categories(rows))
+        self.tab_widget.hide()
+        self.search_results.show()
+        self.statusBar().showMessage(f"{len(rows)} atleta(s) encontrado(s).")
+
+    def create_search_results(self):
+        """Create the table of the search results, in the place of the tabs."""
+        self.search_results = AtletasTableWidget('Busca', [], self.column_names + ['categoria'], db=self.db)
+        self.search_results.setFixedSize(self.tab_widget.size())
+        self.search_results.athleteActivated.connect(self.editarDados)
+        self.search_results.registrationFormsRequested.connect(self.generate_registration_forms)
+        self.mainLayout.insertWidget(self.mainLayout.indexOf(self.tab_widget) + 1, self.search_results)
+
+    def with_categories(self, rows):
         """
+        Append the category of each athlete to its listing row.
 
-        current_widget = self.tab_widget.currentWidget()
-        if current_widget:
-            table_widget = current_widget.table_widget
-            search_text = text.lower()
-            for row in range(table_widget.rowCount()):
-                row_hidden = True
-                for column in range(table_widget.columnCount()):
-                    item = table_widget.item(row, column)
-                    if item is not None and search_text in item.text().lower():
-                        row_hidden = False
-                        break
-                table_widget.setRowHidden(row, row_hidden)
-        else:
-            QMessageBox.warning(self, 'Aviso', 'Nenhuma tabela selecionada.')
+        Parameters:
+            rows (list): Rows returned by ConnectDB.list_summary.
+
+        Returns:
+            list: The rows with the category name as last column, empty if the birth date is invalid.
+        """
+        table = self.category_table()
+        result = []
+        for row in rows:
+            try:
+                category = self.category_of(row, table)
+            except (TypeError, ValueError):
+                category = ''
+            result.append(tuple(row) + (category,))
+        return result
 
     def print_dt(self, selected_dates):
         """
@@ -657,12 +1212,11 @@ class AtletasApp(QMainWindow):
         - Use the "Gerar Lista de Presença" option from the menu to generate an attendance list.
         """
 
-        current_widget = self.tab_widget.currentWidget()
-        if current_widget:
-            table_widget = current_widget.table_widget
-            selected_column = table_widget.currentColumn()
-            if selected_column >= 0:
-                column_name = table_widget.horizontalHeaderItem(selected_column).text()
+        current_widget = self.current_table()
+        if current_widget is not None:
+            column_name = current_widget.current_column_name()
+            if column_name is not None:
+                column_values = current_widget.displayed_values(column_name)
     
                 filename, _ = QFileDialog.getSaveFileName(self, 'Salvar Arquivo PDF', '', 'PDF Files (*.pdf)')
                 if filename:
@@ -682,7 +1236,7 @@ class AtletasApp(QMainWindow):
                     c.drawCentredString(width/2.0, height-2.5*cm, month )
                     
                     # Obtém o número de linhas na coluna selecionada
-                    row_count = table_widget.rowCount()
+                    row_count = len(column_values)
     
                     # Configurar fontes
                     c.setFont("Helvetica-Bold", 12)
@@ -707,7 +1261,7 @@ class AtletasApp(QMainWindow):
                     for i in range(row_count):
                         row = [ ]
                         # Obtém o texto da célula atual
-                        row.append( table_widget.item(i, selected_column).text() )
+                        row.append( column_values[i] )
                         for date in selected_dates:
                             row.append(' ')
                         
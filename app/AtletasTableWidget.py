@@ -1,5 +1,5 @@
-from PyQt5.QtWidgets import QWidget, QTableWidget, QTableWidgetItem, QVBoxLayout,QHBoxLayout, QAbstractItemView, QPushButton, QMenu, QAction, QDialog, QCheckBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QTableView, QVBoxLayout,QHBoxLayout, QAbstractItemView, QPushButton, QMenu, QAction, QDialog, QCheckBox
+from PyQt5.QtCore import Qt, pyqtSignal
 
 import re
 from .whatsapp import sendMessage
@@ -8,9 +8,17 @@ from .whatsapp import sendMessage
 from .ElementSelectionDialog import ElementSelectionDialog
 from .PreSumulaGenerator import FutsalPreSumulaGenerator
 from .autorizacao_menor_liga import create_authorization_form
+from .AthletesTableModel import AthletesTableModel
+from .AthletesFilterProxyModel import AthletesFilterProxyModel
+from .RowFilterIndex import RowFilterIndex
 
 class AtletasTableWidget(QWidget):
-    def __init__(self, category, data, column_names, visible_columns=None):
+    # Emitido com o id do atleta quando uma linha recebe um duplo clique
+    athleteActivated = pyqtSignal(int)
+    # Emitido com os ids dos atletas escolhidos para gerar as fichas de cadastro
+    registrationFormsRequested = pyqtSignal(list)
+
+    def __init__(self, category, data, column_names, visible_columns=None, db=None):
         """
         Cria uma tabela de dados a partir dos dados fornecidos.
 
@@ -19,6 +27,8 @@ class AtletasTableWidget(QWidget):
             column_names (list): Uma lista de nomes de colunas correspondentes aos dados.
             visible_columns (list, opcional): Uma lista de nomes de colunas a serem exibidos. 
                 Se não especificado, todas as colunas serão visíveis.
+            db (ConnectDB, opcional): Conexão usada para buscar o registro completo
+                de um atleta quando a tabela mostra apenas o resumo.
 
         Uso:
         >>> app = QApplication(sys.argv)
@@ -36,18 +46,37 @@ class AtletasTableWidget(QWidget):
         self.column_names = column_names
         self.visible_columns = visible_columns if visible_columns else column_names
         self.original_data = data
-
-        self.table_widget = QTableWidget()
-        self.table_widget.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked)
-        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectRows)
-
-        self.table_widget.setColumnCount(len(self.visible_columns))
-        self.table_widget.setHorizontalHeaderLabels(self.visible_columns)
+        self.db = db
+        # Marcada quando o banco mudou por fora desta aba; recarregada ao ser selecionada
+        self.stale = False
+        # Verdadeira enquanto as linhas chegam em blocos de um BackgroundLoader
+        self.loading = False
+        # Ids dos atletas excluídos pelo usuário e ainda não apagados do banco
+        self.pending_deletes = set()
+
+        # Modelo em colunas; ordenação e filtro passam pelo proxy
+        self.model = AthletesTableModel(self.column_names, data, self)
+        self.proxy_model = AthletesFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setSortRole(Qt.UserRole)
+
+        # Textos normalizados das linhas; o filtro é aplicado de uma vez pelo proxy
+        self.filter_index = RowFilterIndex(self.model)
+        self.filter_text = ''
+        for signal in (self.model.rowsInserted, self.model.rowsRemoved, self.model.modelReset, self.model.dataChanged):
+            signal.connect(self._refilter)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy_model)
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.doubleClicked.connect(self._emit_athlete_activated)
+
+        for col_index, col_name in enumerate(self.column_names):
+            self.table_view.setColumnHidden(col_index, col_name not in self.visible_columns)
 
         self.layout = QVBoxLayout()
 
-        self.populate_table(data)
-
         # Botões para adicionar, excluir e classificar
         button_layout = QHBoxLayout()
         self.addButton = QPushButton("Adicionar Linha")
@@ -64,23 +93,32 @@ class AtletasTableWidget(QWidget):
         self.authFormButton = QPushButton("Gerar Fomulario")
         self.authFormButton.clicked.connect(self.create_form)
 
+        self.registrationFormsButton = QPushButton("Gerar Fichas")
+        self.registrationFormsButton.clicked.connect(self.request_registration_forms)
+
         button_layout.addWidget(self.addButton)
         button_layout.addWidget(self.deleteButton)
         button_layout.addWidget(self.sortButton)
         button_layout.addWidget(self.presumulaButton)
         button_layout.addWidget(self.authFormButton)
+        button_layout.addWidget(self.registrationFormsButton)
 
         # Adicionar botão para seleção de colunas
         self.select_columns_button = QPushButton("Selecionar Colunas", self)
         self.select_columns_button.clicked.connect(self.open_column_selection_dialog)
         self.layout.addWidget(self.select_columns_button)
 
-        self.layout.addWidget(self.table_widget)
+        self.layout.addWidget(self.table_view)
         self.layout.addLayout(button_layout)  # Adicione o layout dos botões à janela principal
         self.setLayout(self.layout)
 
         # Conecte o sinal de clique de cabeçalho de coluna a um slot para exibir o menu pop-up
-        self.table_widget.horizontalHeader().sectionClicked.connect(self.show_column_menu)
+        self.table_view.horizontalHeader().sectionClicked.connect(self.show_column_menu)
+
+    def _emit_athlete_activated(self, index):
+        athlete_id = self.model.id_at(self.proxy_model.mapToSource(index).row())
+        if athlete_id is not None:
+            self.athleteActivated.emit(int(athlete_id))
 
     def open_column_selection_dialog(self):
         dialog = QDialog(self)
@@ -103,9 +141,9 @@ class AtletasTableWidget(QWidget):
 
     def update_visible_columns(self, checkboxes, dialog):
         selected_columns = [name for name, checkbox in checkboxes.items() if checkbox.isChecked()]
-        for col_index in range(self.table_widget.columnCount()):
-            col_name = self.table_widget.horizontalHeaderItem(col_index).text()
-            self.table_widget.setColumnHidden(col_index, col_name not in selected_columns)
+        for col_index, col_name in enumerate(self.column_names):
+            self.table_view.setColumnHidden(col_index, col_name not in selected_columns)
+        self.visible_columns = selected_columns
         dialog.accept()
 
     def show_column_menu(self, column):
@@ -151,13 +189,109 @@ class AtletasTableWidget(QWidget):
         Args:
             data (list): Uma lista de listas contendo os dados a serem exibidos na tabela.
         """
-        self.table_widget.setRowCount(len(data))
-        for row in range(len(data)):
-            for column in range(len(self.visible_columns)):
-                column_name = self.visible_columns[column]
-                column_index = self.column_names.index(column_name)
-                item = QTableWidgetItem(str(data[row][column_index]))
-                self.table_widget.setItem(row, column, item)
+        self.model.set_rows(data)
+
+    def find_row(self, athlete_id):
+        """
+        Retorna o índice da linha de um atleta no modelo.
+
+        Args:
+            athlete_id (int): O id do atleta.
+
+        Returns:
+            int or None: O índice da linha, ou None se o atleta não estiver na tabela.
+        """
+        return self.model.row_for_id(athlete_id)
+
+    def upsert_athlete(self, row_data):
+        """
+        Atualiza a linha de um atleta, ou a adiciona ao final da tabela se ele ainda não estiver nela.
+
+        Args:
+            row_data (list): Os dados da linha, na ordem de column_names.
+
+        Uso:
+        >>> table_widget.upsert_athlete(db.read_summary(42))
+        """
+        self.model.upsert(row_data)
+
+    def remove_athlete(self, athlete_id):
+        """
+        Remove a linha de um atleta da tabela.
+
+        Args:
+            athlete_id (int): O id do atleta.
+
+        Returns:
+            bool: True se a linha foi removida, False se o atleta não estava na tabela.
+        """
+        return self.model.remove_id(athlete_id)
+
+    def athlete_ids(self):
+        """
+        Retorna os ids de todos os atletas da tabela, inclusive os ocultos pelo filtro.
+
+        Returns:
+            list: Os ids dos atletas.
+        """
+        return self.model.ids()
+
+    def selected_source_rows(self):
+        """
+        Retorna as linhas do modelo correspondentes às linhas selecionadas na tabela.
+
+        Returns:
+            list: Os índices das linhas no modelo.
+        """
+        return [self.proxy_model.mapToSource(index).row()
+                for index in self.table_view.selectionModel().selectedRows()]
+
+    def selected_ids(self):
+        """
+        Retorna os ids dos atletas selecionados na tabela.
+
+        Returns:
+            list: Os ids dos atletas selecionados.
+        """
+        ids = (self.model.id_at(row) for row in self.selected_source_rows())
+        return [athlete_id for athlete_id in ids if athlete_id is not None]
+
+    def selected_column_names(self):
+        """
+        Retorna os nomes das colunas selecionadas na tabela.
+
+        Returns:
+            list: Os nomes das colunas.
+        """
+        return [self.column_names[index.column()]
+                for index in self.table_view.selectionModel().selectedColumns()]
+
+    def current_column_name(self):
+        """
+        Retorna o nome da coluna da célula atual, ou None se não houver célula atual.
+        """
+        column = self.table_view.currentIndex().column()
+        return self.column_names[column] if column >= 0 else None
+
+    def displayed_values(self, column_name):
+        """
+        Retorna os valores de uma coluna na ordem em que são exibidos, respeitando o filtro.
+
+        Args:
+            column_name (str): O nome da coluna.
+
+        Returns:
+            list: Os textos das células.
+        """
+        column = self.column_names.index(column_name)
+        return [self.proxy_model.index(row, column).data() for row in range(self.proxy_model.rowCount())]
+
+    def displayed_ids(self):
+        """
+        Retorna os ids dos atletas na ordem em que são exibidos, respeitando o filtro.
+        """
+        return [self.model.id_at(self.proxy_model.mapToSource(self.proxy_model.index(row, 0)).row())
+                for row in range(self.proxy_model.rowCount())]
 
     def get_selected_data(self):
         """
@@ -169,12 +303,8 @@ class AtletasTableWidget(QWidget):
         Uso:
         >>> selected_data = table_widget.get_selected_data()
         """
-        selected_rows = []
-        for selected_item in self.table_widget.selectedItems():
-            row = selected_item.row()
-            selected_row = [self.table_widget.item(row, col).text() for col in range(self.table_widget.columnCount())]
-            selected_rows.append(selected_row)
-        return selected_rows
+        return [[self.model.data(self.model.index(row, col)) for col in range(self.model.columnCount())]
+                for row in self.selected_source_rows()]
 
     def add_row(self):
         """
@@ -183,21 +313,21 @@ class AtletasTableWidget(QWidget):
         Uso:
         >>> table_widget.add_row()
         """
-        self.table_widget.insertRow(self.table_widget.rowCount())
-        for column in range(self.table_widget.columnCount()):
-            item = QTableWidgetItem('')
-            self.table_widget.setItem(self.table_widget.rowCount() - 1, column, item)
+        self.model.append_rows([[None] * len(self.column_names)])
 
     def delete_selected_row(self):
         """
         Exclui a linha selecionada na tabela.
 
+        Os ids dos atletas excluídos ficam em pending_deletes até serem apagados
+        do banco por AtletasApp.save_data.
+
         Uso:
         >>> table_widget.delete_selected_row()
         """
-        selected_rows = self.table_widget.selectionModel().selectedRows()
-        for row in selected_rows:
-            self.table_widget.removeRow(row.row())
+        rows = self.selected_source_rows()
+        self.pending_deletes.update(athlete_id for athlete_id in map(self.model.id_at, rows) if athlete_id is not None)
+        self.model.remove_rows(rows)
 
     def sort_table(self):
         """
@@ -206,7 +336,7 @@ class AtletasTableWidget(QWidget):
         Uso:
         >>> table_widget.sort_table()
         """
-        self.table_widget.sortByColumn(1, Qt.AscendingOrder)
+        self.sort_table_by_column('nome')
         
     def sort_table_by_column(self, column_name):
         """
@@ -219,11 +349,11 @@ class AtletasTableWidget(QWidget):
         >>> table_widget.sort_table_by_column("Nome")
         """
         # Encontre o índice da coluna pelo nome
-        if column_name in self.visible_columns:
-            column_index = self.visible_columns.index(column_name)
+        if column_name in self.column_names:
+            column_index = self.column_names.index(column_name)
     
             # Classifique a tabela com base na coluna
-            self.table_widget.sortItems(column_index, Qt.AscendingOrder)
+            self.table_view.sortByColumn(column_index, Qt.AscendingOrder)
 
     def filter_table(self, filter_text):
         """
@@ -232,17 +362,20 @@ class AtletasTableWidget(QWidget):
         Args:
             filter_text (str): O texto de filtro a ser aplicado.
 
+        Mostra as linhas que contêm todas as palavras do texto, sem diferenciar
+        maiúsculas nem acentos. Quando o texto apenas continua o anterior, só as
+        linhas já encontradas são verificadas de novo.
+
         Uso:
         >>> table_widget.filter_table("John")
         """
-        for row in range(self.table_widget.rowCount()):
-            should_show = False
-            for column in range(self.table_widget.columnCount()):
-                item = self.table_widget.item(row, column)
-                if item and filter_text.lower() in item.text().lower():
-                    should_show = True
-                    break
-            self.table_widget.setRowHidden(row, not should_show)
+        self.filter_text = filter_text
+        self.proxy_model.set_accepted_rows(self.filter_index.match(filter_text))
+
+    def _refilter(self, *args):
+        # Linhas novas ou alteradas entram no filtro ativo
+        if self.filter_text:
+            self.proxy_model.set_accepted_rows(self.filter_index.match(self.filter_text))
 
     def resize_columns_to_fit(self):
         """
@@ -251,7 +384,7 @@ class AtletasTableWidget(QWidget):
         Uso:
         >>> table_widget.resize_columns_to_fit()
         """
-        self.table_widget.resizeColumnsToContents()
+        self.table_view.resizeColumnsToContents()
 
     def get_row_count(self):
         """
@@ -263,7 +396,7 @@ class AtletasTableWidget(QWidget):
         Uso:
         >>> row_count = table_widget.get_row_count()
         """
-        return self.table_widget.rowCount()
+        return self.model.rowCount()
 
     def create_presumula(self):
         """
@@ -282,8 +415,7 @@ class AtletasTableWidget(QWidget):
             >>> app.exec_()
         """
         # Get the data from the 'nome' column
-        column_index = self.column_names.index('nome')
-        data = [self.table_widget.item(row, column_index).text() for row in range(self.table_widget.rowCount())]
+        data = self.displayed_values('nome')
 
         # Create the element selection dialog and get the selected elements
         dialog = ElementSelectionDialog(data)
@@ -301,6 +433,20 @@ class AtletasTableWidget(QWidget):
         else:
             print("Pre-Summary creation canceled by the user.")
 
+    def request_registration_forms(self):
+        """
+        Select athletes from the 'nome' column and request their registration forms.
+
+        Emits registrationFormsRequested with the ids of the selected athletes; the
+        forms are generated by whoever owns the database configuration.
+        """
+        data = self.displayed_values('nome')
+        ids = self.displayed_ids()
+
+        dialog = ElementSelectionDialog(data)
+        if dialog.exec_() == QDialog.Accepted and dialog.selected_elements:
+            self.registrationFormsRequested.emit([int(ids[data.index(element)]) for element in dialog.selected_elements])
+
     def create_form(self):
         """
         Create an authorization form for selected athletes.
@@ -308,8 +454,8 @@ class AtletasTableWidget(QWidget):
         Opens a dialog to select athletes from the 'nome' column, and creates an authorization form for each.
         """
         # Get the data from the 'nome' column
-        column_index_nome = self.column_names.index('nome')
-        data = [self.table_widget.item(row, column_index_nome).text() for row in range(self.table_widget.rowCount())]
+        data = self.displayed_values('nome')
+        ids = self.displayed_ids()
 
         # Create the element selection dialog and get the selected elements
         dialog = ElementSelectionDialog(data)
@@ -320,11 +466,10 @@ class AtletasTableWidget(QWidget):
             print("Selected elements:", selected_elements)
 
             for element in selected_elements:
-                # Gather all information for the selected athlete
-                athlete_data = {}
-                for column_name in self.column_names:
-                    column_index = self.column_names.index(column_name)
-                    athlete_data[column_name] = self.table_widget.item(data.index(element), column_index).text()
+                # Gather all information for the selected athlete; the table only holds the summary
+                athlete_id = ids[data.index(element)]
+                record = self.db.readById(athlete_id)
+                athlete_data = {name: str(value) for name, value in zip(['id'] + self.db.keys, record)}
 
                 telefone = athlete_data['foneContato']
                 
@@ -0,0 +1,322 @@
+import sqlite3
+import hashlib
+
+# Binary documents kept outside the athletes table
+ATTACHMENT_KINDS = ('foto', 'rg_pdf', 'atestado_pdf', 'autorizacao_pdf', 'foto_thumb')
+
+class AttachmentStore:
+    """
+    A class for storing the binary documents of the athletes (photo and scanned PDFs).
+
+    The documents live in a separate 'attachments' table keyed by athlete id and kind,
+    so that listing queries over the athletes table never touch the BLOBs. The content
+    itself is stored once per SHA-256 digest in 'attachment_blobs' and shared by every
+    attachment with the same bytes; triggers keep a reference count and delete a blob
+    when its last attachment goes away.
+
+    Parameters:
+        db (ConnectDB): The database connection object.
+
+    Example:
+    >>> store = AttachmentStore(db)
+    >>> store.createTable('athletes')
+    >>> store.put(1, 'foto', image_bytes)
+    >>> db.commit_db()
+    >>> data = store.get(1, 'foto')
+    """
+    tbName = 'attachments'
+    blobTable = 'attachment_blobs'
+
+    def __init__(self, db):
+        """
+        Initialize the AttachmentStore instance.
+
+        Parameters:
+            db (ConnectDB): The database connection object.
+        """
+        self.db = db
+
+    def createTable(self, owner_table):
+        """
+        Create the attachments and blobs tables, the triggers that maintain the blob
+        reference counts and the trigger that removes the attachments of an athlete
+        deleted from the owner table. Attachments stored inline by an earlier version
+        are moved to the blobs table.
+
+        Parameters:
+            owner_table (str): The name of the athletes table.
+
+        Raises:
+            sqlite3.Error: If the inline attachments could not be moved.
+
+        Usage:
+        >>> store.createTable('athletes')
+        """
+        columns = [row[1] for row in self.db.conn.execute(f"PRAGMA table_info({self.tbName})")]
+        inline = 'data' in columns
+        if inline:
+            # The owner trigger would follow the renamed table, recreate it afterwards
+            self.db.conn.executescript(f'''
+                DROP TRIGGER IF EXISTS {owner_table}_delete_attachments;
+                ALTER TABLE {self.tbName} RENAME TO {self.tbName}_inline;
+            ''')
+
+        self.db.conn.executescript(f'''
+            CREATE TABLE IF NOT EXISTS {self.blobTable} (
+                id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+                sha256 TEXT NOT NULL UNIQUE,
+                data BLOB NOT NULL,
+                refcount INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS {self.tbName} (
+                id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+                athlete_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                blob_id INTEGER NOT NULL REFERENCES {self.blobTable} (id),
+                UNIQUE (athlete_id, kind)
+            );
+            CREATE TRIGGER IF NOT EXISTS {self.tbName}_blob_ref
+            AFTER INSERT ON {self.tbName}
+            BEGIN
+                UPDATE {self.blobTable} SET refcount = refcount + 1 WHERE id = NEW.blob_id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS {self.tbName}_blob_unref
+            AFTER DELETE ON {self.tbName}
+            BEGIN
+                UPDATE {self.blobTable} SET refcount = refcount - 1 WHERE id = OLD.blob_id;
+                DELETE FROM {self.blobTable} WHERE id = OLD.blob_id AND refcount <= 0;
+            END;
+            CREATE TRIGGER IF NOT EXISTS {self.tbName}_blob_swap
+            AFTER UPDATE OF blob_id ON {self.tbName}
+            WHEN OLD.blob_id <> NEW.blob_id
+            BEGIN
+                UPDATE {self.blobTable} SET refcount = refcount + 1 WHERE id = NEW.blob_id;
+                UPDATE {self.blobTable} SET refcount = refcount - 1 WHERE id = OLD.blob_id;
+                DELETE FROM {self.blobTable} WHERE id = OLD.blob_id AND refcount <= 0;
+            END;
+            CREATE TRIGGER IF NOT EXISTS {owner_table}_delete_attachments
+            AFTER DELETE ON {owner_table}
+            BEGIN
+                DELETE FROM {self.tbName} WHERE athlete_id = OLD.id;
+            END;
+        ''')
+
+        # Also resumes a move interrupted by an error in a previous run
+        leftover = self.db.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{self.tbName}_inline",)).fetchone()
+        if leftover:
+            self._move_inline_attachments()
+
+    def _move_inline_attachments(self):
+        """
+        Store the attachments of the previous inline table as shared blobs and drop it.
+
+        Raises:
+            sqlite3.Error: If the move fails; it is rolled back and the inline table is
+                kept, so the next createTable resumes it.
+        """
+        print("Deduplicating attachments ...")
+        old_table = f"{self.tbName}_inline"
+        try:
+            rows = self.db.conn.execute(f"SELECT athlete_id, kind, id FROM {old_table} WHERE data IS NOT NULL").fetchall()
+            for athlete_id, kind, rowid in rows:
+                data = self.db.conn.execute(f"SELECT data FROM {old_table} WHERE id = ?", (rowid,)).fetchone()[0]
+                self.put(athlete_id, kind, data)
+            self.db.conn.execute(f"DROP TABLE {old_table}")
+            self.db.conn.commit()
+        except sqlite3.Error:
+            self.db.conn.rollback()
+            raise
+
+        self.db.conn.execute("VACUUM")
+        unique = self.db.conn.execute(f"SELECT count(*) FROM {self.blobTable}").fetchone()[0]
+        print("%d attachments stored as %d unique blobs." % (len(rows), unique))
+
+    def put(self, athlete_id, kind, data):
+        """
+        Insert or replace an attachment. The caller is responsible for committing.
+
+        Content already stored for any athlete is not stored again.
+
+        Parameters:
+            athlete_id (int): The ID of the athlete.
+            kind (str): The attachment kind, one of ATTACHMENT_KINDS.
+            data (bytes): The binary content.
+
+        Usage:
+        >>> store.put(1, 'rg_pdf', pdf_bytes)
+        """
+        if kind not in ATTACHMENT_KINDS:
+            raise ValueError(f"Unknown attachment kind: {kind}")
+        blob_id = self._store_blob(bytes(data))
+        sql = f'''INSERT INTO {self.tbName} (athlete_id, kind, blob_id) VALUES (?, ?, ?)
+                  ON CONFLICT (athlete_id, kind) DO UPDATE SET blob_id = excluded.blob_id'''
+        self.db.conn.execute(sql, (athlete_id, kind, blob_id))
+
+    def _store_blob(self, data):
+        """Returns the id of the blob holding the content, storing it if it is new."""
+        digest = hashlib.sha256(data).hexdigest()
+        self.db.conn.execute(
+            f"INSERT INTO {self.blobTable} (sha256, data) VALUES (?, ?) ON CONFLICT (sha256) DO NOTHING",
+            (digest, sqlite3.Binary(data)))
+        return self.db.conn.execute(f"SELECT id FROM {self.blobTable} WHERE sha256 = ?", (digest,)).fetchone()[0]
+
+    def get(self, athlete_id, kind, conn=None):
+        """
+        Retrieve the content of an attachment.
+
+        Parameters:
+            athlete_id (int): The ID of the athlete.
+            kind (str): The attachment kind.
+            conn (sqlite3.Connection, optional): The connection to read with, such as one
+                from ConnectDB.open_reader. Defaults to the main connection.
+
+        Returns:
+            bytes or None: The binary content, or None if the athlete has no such attachment.
+
+        Usage:
+        >>> data = store.get(1, 'foto')
+        """
+        sql = f'''SELECT b.data FROM {self.tbName} a JOIN {self.blobTable} b ON b.id = a.blob_id
+                  WHERE a.athlete_id = ? AND a.kind = ?'''
+        row = (conn or self.db.conn).execute(sql, (athlete_id, kind)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def read(self, athlete_id, kind):
+        """
+        Read the content of an attachment using incremental BLOB I/O when available.
+
+        Parameters:
+            athlete_id (int): The ID of the athlete.
+            kind (str): The attachment kind.
+
+        Returns:
+            bytes or None: The binary content, or None if the athlete has no such attachment.
+        """
+        if not hasattr(self.db.conn, 'blobopen'):  # Python < 3.11
+            return self.get(athlete_id, kind)
+
+        rowid = self._rowid(athlete_id, kind)
+        if rowid is None:
+            return None
+        with self.db.conn.blobopen(self.blobTable, 'data', rowid, readonly=True) as blob:
+            return blob.read()
+
+    def copy_to(self, athlete_id, kind, file, chunk_size=64 * 1024):
+        """
+        Write the content of an attachment to a binary file in chunks, without
+        holding the whole document in memory when incremental BLOB I/O is available.
+
+        Parameters:
+            athlete_id (int): The ID of the athlete.
+            kind (str): The attachment kind.
+            file (file object): A file opened in binary write mode.
+            chunk_size (int, optional): The size of each chunk in bytes. Defaults to 64 KiB.
+
+        Returns:
+            bool: True if the attachment exists and was written, False otherwise.
+
+        Usage:
+        >>> with open('rg.pdf', 'wb') as f:
+        ...     store.copy_to(1, 'rg_pdf', f)
+        """
+        if not hasattr(self.db.conn, 'blobopen'):  # Python < 3.11
+            data = self.get(athlete_id, kind)
+            if data is None:
+                return False
+            file.write(data)
+            return True
+
+        rowid = self._rowid(athlete_id, kind)
+        if rowid is None:
+            return False
+        with self.db.conn.blobopen(self.blobTable, 'data', rowid, readonly=True) as blob:
+            for chunk in iter(lambda: blob.read(chunk_size), b''):
+                file.write(chunk)
+        return True
+
+    def _rowid(self, athlete_id, kind):
+        """Returns the rowid of the blob of an attachment, or None if it does not exist."""
+        sql = f"SELECT blob_id FROM {self.tbName} WHERE athlete_id = ? AND kind = ?"
+        row = self.db.conn.execute(sql, (athlete_id, kind)).fetchone()
+        return row[0] if row else None
+
+    def kinds(self, athlete_id):
+        """
+        List the attachment kinds stored for an athlete, without reading their content.
+
+        Parameters:
+            athlete_id (int): The ID of the athlete.
+
+        Returns:
+            list: The attachment kinds present for the athlete.
+        """
+        sql = f"SELECT kind FROM {self.tbName} WHERE athlete_id = ?"
+        return [row[0] for row in self.db.conn.execute(sql, (athlete_id,))]
+
+    def remove(self, athlete_id, kind=None):
+        """
+        Remove one attachment, or all the attachments of an athlete if kind is None.
+
+        Parameters:
+            athlete_id (int): The ID of the athlete.
+            kind (str, optional): The attachment kind. Defaults to None.
+        """
+        if kind is None:
+            self.db.conn.execute(f"DELETE FROM {self.tbName} WHERE athlete_id = ?", (athlete_id,))
+        else:
+            self.db.conn.execute(f"DELETE FROM {self.tbName} WHERE athlete_id = ? AND kind = ?", (athlete_id, kind))
+
+    def migrate(self, owner_table):
+        """
+        Move the BLOB columns of an older athletes table into the attachments table.
+
+        The legacy columns are dropped when the SQLite version supports it, otherwise
+        they are emptied. The database is vacuumed afterwards to give the space back.
+
+        Parameters:
+            owner_table (str): The name of the athletes table.
+
+        Returns:
+            int: The number of attachments moved.
+
+        Raises:
+            sqlite3.Error: If the move fails; it is rolled back and the legacy columns are kept.
+
+        Usage:
+        >>> moved = store.migrate('athletes')
+        """
+        columns = [row[1] for row in self.db.conn.execute(f"PRAGMA table_info({owner_table})")]
+        legacy = [kind for kind in ATTACHMENT_KINDS if kind in columns]
+        if not legacy:
+            return 0
+
+        print("Moving attachments out of table %s ..." % owner_table)
+        moved = 0
+        try:
+            for kind in legacy:
+                rows = self.db.conn.execute(
+                    f'''SELECT id FROM {owner_table} WHERE {kind} IS NOT NULL AND length({kind}) > 0
+                        AND id NOT IN (SELECT athlete_id FROM {self.tbName} WHERE kind = ?)''', (kind,)).fetchall()
+                for (athlete_id,) in rows:
+                    data = self.db.conn.execute(f"SELECT {kind} FROM {owner_table} WHERE id = ?", (athlete_id,)).fetchone()[0]
+                    self.put(athlete_id, kind, data)
+                moved += len(rows)
+
+            for kind in legacy:
+                try:
+                    self.db.conn.execute(f"ALTER TABLE {owner_table} DROP COLUMN {kind}")
+                except sqlite3.OperationalError:
+                    # SQLite < 3.35: keep the column but release its content
+                    try:
+                        self.db.conn.execute(f"UPDATE {owner_table} SET {kind} = NULL")
+                    except sqlite3.IntegrityError:
+                        self.db.conn.execute(f"UPDATE {owner_table} SET {kind} = X''")
+            self.db.conn.commit()
+        except sqlite3.Error:
+            self.db.conn.rollback()
+            raise
+
+        self.db.conn.execute("VACUUM")
+        print("%d attachments moved." % moved)
+        return moved
@@ -0,0 +1,80 @@
+from itertools import islice
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class LoaderSignals(QObject):
+    """
+    The signals of a BackgroundLoader. They are emitted on the worker thread and
+    delivered on the thread of the receivers, so slots may update widgets.
+
+    Signals:
+        chunkLoaded (list): A chunk of rows.
+        progress (int): The number of rows read so far.
+        finished (bool): The read ended; False if it was cancelled.
+        failed (str): The read stopped on an error.
+    """
+    chunkLoaded = pyqtSignal(list)
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+
+class BackgroundLoader(QRunnable):
+    """
+    Reads rows from the database on a QThreadPool thread and streams them in chunks.
+
+    The rows are read on a read-only connection of its own (see ConnectDB.reading),
+    so a slow database, such as one on a network share, does not freeze the window.
+    Each chunk is delivered through the chunkLoaded signal as soon as it is read.
+
+    Args:
+        db (ConnectDB): The database to read from.
+        read (callable): Called on the worker thread with the reader connection; returns
+            the rows, usually the cursor of a query.
+        chunk_size (int, optional): The number of rows per chunk. Defaults to 200.
+        total (int, optional): The number of rows expected, for progress indicators.
+
+    Usage:
+    >>> column_names, sql, parameters = db.summary_query()
+    >>> loader = BackgroundLoader(db, lambda conn: conn.execute(sql, parameters))
+    >>> loader.signals.chunkLoaded.connect(model.append_rows)
+    >>> loader.start()
+    """
+
+    def __init__(self, db, read, chunk_size=200, total=None):
+        super().__init__()
+        self.db = db
+        self.read = read
+        self.chunk_size = chunk_size
+        self.total = total
+        self.loaded = 0
+        self.cancelled = False
+        self.signals = LoaderSignals()
+
+    def start(self, pool=None):
+        """
+        Queue the loader on a thread pool.
+
+        Args:
+            pool (QThreadPool, optional): The pool to run on. Defaults to the global pool.
+        """
+        (pool or QThreadPool.globalInstance()).start(self)
+
+    def cancel(self):
+        """Stop reading after the current chunk. Chunks already emitted may still be delivered."""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            with self.db.reading() as conn:
+                rows = iter(self.read(conn))
+                while not self.cancelled:
+                    chunk = list(islice(rows, self.chunk_size))
+                    if not chunk:
+                        break
+                    self.loaded += len(chunk)
+                    self.signals.chunkLoaded.emit(chunk)
+                    self.signals.progress.emit(self.loaded)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(not self.cancelled)
@@ -0,0 +1,147 @@
+import os
+import zipfile
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+
+from .FormLayout import FormLayout
+from .RegistrationForm import RegistrationForm
+from .paths import path
+
+# Resources parsed once per worker process by _init_worker
+_worker = {}
+
+def _init_worker(header_text, logo, form_layout):
+    """Keeps the header, the logo path and the compiled form layout for the worker's lifetime."""
+    _worker['header_text'] = header_text
+    _worker['logo'] = logo
+    _worker['form_layout'] = form_layout
+
+def _render_form(athlete_data):
+    """Renders the registration form of one athlete and returns the PDF bytes."""
+    buffer = BytesIO()
+    registration_form = RegistrationForm(header_text=_worker['header_text'], logo=_worker['logo'],
+                                         form_filename=buffer, form_layout=_worker['form_layout'])
+    registration_form.create_form(athlete_data)
+    registration_form.save_pdf()
+    return buffer.getvalue()
+
+
+class BatchFormGenerator:
+    """
+    Generates the registration forms of many athletes at once.
+
+    The forms are rendered in parallel by a process pool. The form layout is compiled
+    once in the parent and handed to each worker when it starts, and each worker decodes
+    the logo once through ImageCache, instead of doing both again for every athlete.
+    The result is a single multi-page PDF or a zip file with one PDF per athlete.
+
+    Args:
+        header_text (str): Text displayed in the form header.
+        logo (str): Path to the club logo.
+        layout_file (str, optional): Path to the form YAML layout. Defaults to data/yml/form.yaml.
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs;
+            1 renders in the calling process.
+
+    Batches smaller than parallel_threshold are rendered in the calling process, since
+    starting the workers costs more than it saves for a handful of forms.
+
+    Example:
+        generator = BatchFormGenerator(header_text, logo='logo.png')
+        records = BatchFormGenerator.records_from_db(db, [1, 2, 3])
+        generator.generate(records, 'fichas_sub-13.pdf')
+    """
+
+    parallel_threshold = 24
+
+    def __init__(self, header_text, logo, layout_file=os.path.join(path.yaml, 'form.yaml'), max_workers=None):
+        self.header_text = header_text
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.form_layout = FormLayout.from_file(layout_file)
+
+        self.logo = logo
+
+    @staticmethod
+    def records_from_db(db, athlete_ids):
+        """
+        Reads the data needed by the forms, as plain dictionaries that can be sent to the workers.
+
+        Args:
+            db (ConnectDB): The database connection.
+            athlete_ids (list): The ids of the athletes.
+
+        Returns:
+            list: One dictionary per athlete found, with the photo as raw bytes.
+        """
+        records = []
+        for athlete_id in athlete_ids:
+            row = db.readById(athlete_id)
+            if row is None:
+                continue
+            record = {k: v for k, v in zip(db.keys, row[1:]) if v is not None}
+            photo = db.attachments.read(athlete_id, 'foto')
+            if photo:
+                record['foto'] = photo
+            records.append(record)
+        return records
+
+    def render(self, records):
+        """
+        Renders the forms of the given athletes.
+
+        Args:
+            records (list): Athlete dictionaries, as returned by records_from_db.
+
+        Returns:
+            list: The PDF bytes of each form, in the order of records.
+        """
+        init_args = (self.header_text, self.logo, self.form_layout)
+        workers = min(self.max_workers, len(records))
+
+        if workers <= 1 or len(records) < self.parallel_threshold:
+            _init_worker(*init_args)
+            return [_render_form(record) for record in records]
+
+        # 'spawn' keeps the workers free of the GUI process state
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=init_args) as executor:
+            chunksize = max(1, len(records) // (workers * 4))
+            return list(executor.map(_render_form, records, chunksize=chunksize))
+
+    def save_pdf(self, records, output):
+        """Renders the forms and writes them as a single multi-page PDF."""
+        merged = fitz.open()
+        for pdf_bytes in self.render(records):
+            with fitz.open('pdf', pdf_bytes) as form:
+                merged.insert_pdf(form)
+        merged.save(output, garbage=3, deflate=True)
+        merged.close()
+
+    def save_zip(self, records, output):
+        """
+        Renders the forms and writes them to a zip file, one PDF per athlete.
+
+        Each entry starts with the position of the athlete in records, so athletes
+        with the same name and no registration number do not overwrite each other.
+        """
+        width = len(str(len(records)))
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for index, (record, pdf_bytes) in enumerate(zip(records, self.render(records)), 1):
+                name = f"{record.get('matricula', '')}_{record.get('nome', '')}".strip('_').replace(' ', '_')
+                archive.writestr(f"{index:0{width}d}_{name or 'ficha'}.pdf", pdf_bytes)
+
+    def generate(self, records, output):
+        """
+        Renders the forms into a PDF or a zip file, depending on the output extension.
+
+        Args:
+            records (list): Athlete dictionaries, as returned by records_from_db.
+            output (str): Path of the .pdf or .zip file to create.
+        """
+        if output.lower().endswith('.zip'):
+            self.save_zip(records, output)
+        else:
+            self.save_pdf(records, output)
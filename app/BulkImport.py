@@ -0,0 +1,233 @@
+import os
+import csv
+import sys
+import argparse
+import logging
+from datetime import datetime, date
+
+from .ConnectDB import ConnectDB
+from .RegistrationNumber import RegistrationNumber
+from .AppConfigManager import AppConfigManager
+
+class AthleteImporter:
+    """
+    Imports athletes in bulk from a CSV or XLSX file.
+
+    Rows are streamed from the file, validated against the table schema keys and
+    inserted with executemany in chunks, one transaction per chunk. Registration
+    numbers missing from the file are reserved in blocks per category.
+
+    Args:
+        db (ConnectDB): The database connection, with the athletes table already created.
+        chunk_size (int, optional): Number of rows per transaction. Defaults to 500.
+        current_year (int, optional): Year used for the registration numbers. Defaults to the current year.
+
+    Example:
+        importer = AthleteImporter(db)
+        inserted, errors = importer.import_file('elenco.csv')
+    """
+
+    required_keys = ('nome', 'dtNascimento')
+    true_values = {'1', 'true', 'sim', 's', 'yes', 'x'}
+
+    def __init__(self, db, chunk_size=500, current_year=None):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.current_year = current_year or datetime.now().year
+
+        # Column types, to convert boolean cells and keep column defaults
+        table_info = self.db.conn.execute(f"PRAGMA table_info({self.db.tbName})").fetchall()
+        self.boolean_keys = {row[1] for row in table_info if (row[2] or '').upper() == 'BOOLEAN'}
+        self.defaults = {row[1]: row[4] for row in table_info if row[4] is not None}
+
+    def read_rows(self, file_name):
+        """
+        Streams the rows of a CSV or XLSX file as dictionaries keyed by the header.
+
+        Args:
+            file_name (str): Path to a .csv or .xlsx file.
+
+        Yields:
+            tuple: The line number and a dictionary with the row values.
+        """
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension == '.xlsx':
+            yield from self._read_xlsx(file_name)
+        elif extension == '.csv':
+            yield from self._read_csv(file_name)
+        else:
+            raise ValueError(f"Unsupported file type: {extension}")
+
+    def _read_csv(self, file_name):
+        with open(file_name, newline='', encoding='utf-8-sig') as f:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            for line, row in enumerate(csv.DictReader(f, dialect=dialect), start=2):
+                yield line, row
+
+    def _read_xlsx(self, file_name):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportError("openpyxl is required to import .xlsx files (pip install openpyxl)")
+
+        workbook = load_workbook(file_name, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else '' for cell in next(rows, ())]
+            for line, values in enumerate(rows, start=2):
+                yield line, dict(zip(header, values))
+        finally:
+            workbook.close()
+
+    def validate(self, row):
+        """
+        Converts a file row into column values, keeping only the schema keys.
+
+        Args:
+            row (dict): The row read from the file.
+
+        Returns:
+            dict: The column values of the athlete.
+
+        Raises:
+            ValueError: If a required value is missing or the birth date is invalid or in the future.
+        """
+        fields = {}
+        for key, value in row.items():
+            key = (key or '').strip()
+            if key not in self.db.keys:
+                continue
+            if isinstance(value, (datetime, date)):
+                value = value.strftime("%d/%m/%Y")
+            elif isinstance(value, str):
+                value = value.strip()
+            if value in ('', None):
+                continue
+            if key in self.boolean_keys:
+                value = str(value).strip().lower() in self.true_values
+            fields[key] = value
+
+        missing = [key for key in self.required_keys if key not in fields]
+        if missing:
+            raise ValueError("missing %s" % ', '.join(missing))
+
+        birth_date = datetime.strptime(str(fields['dtNascimento']), "%d/%m/%Y")
+        if birth_date.year > self.current_year:
+            raise ValueError(f"birth year after {self.current_year}")
+        fields['dtNascimento'] = birth_date.strftime("%d/%m/%Y")
+        return fields
+
+    def import_file(self, file_name):
+        """
+        Imports all the athletes of a file.
+
+        Args:
+            file_name (str): Path to a .csv or .xlsx file.
+
+        Returns:
+            tuple: The number of inserted athletes and a list of (line, message) errors.
+        """
+        inserted = 0
+        errors = []
+        chunk = []
+
+        for line, row in self.read_rows(file_name):
+            try:
+                chunk.append((line, self.validate(row)))
+            except ValueError as e:
+                errors.append((line, str(e)))
+
+            if len(chunk) >= self.chunk_size:
+                inserted += self._insert_chunk(chunk, errors)
+                chunk = []
+
+        if chunk:
+            inserted += self._insert_chunk(chunk, errors)
+
+        logging.info(f"{inserted} athletes imported from {file_name}, {len(errors)} rows rejected.")
+        return inserted, errors
+
+    def _insert_chunk(self, chunk, errors):
+        """
+        Inserts a chunk of validated rows in a single transaction. If the chunk fails,
+        its rows are inserted one by one, so that only the rows at fault are rejected.
+        """
+        try:
+            return self._insert_rows(chunk)
+        except Exception as e:
+            if len(chunk) == 1:
+                errors.append((chunk[0][0], f"not imported: {e}"))
+                return 0
+        return sum(self._insert_chunk([row], errors) for row in chunk)
+
+    def _insert_rows(self, chunk):
+        """Inserts validated rows in a single transaction and returns how many were inserted."""
+        columns = [key for key in self.db.keys if any(key in fields for _, fields in chunk)]
+        if RegistrationNumber.columnName not in columns:
+            columns.append(RegistrationNumber.columnName)
+
+        # The numbers are assigned to copies, since a failed chunk is retried row by row
+        rows = [dict(fields) for _, fields in chunk]
+        with self.db.transaction() as conn:
+            self._assign_registration_numbers(rows)
+            values = [tuple(fields.get(key, self.defaults.get(key)) for key in columns) for fields in rows]
+            placeholders = ','.join(['?' for _ in columns])
+            conn.executemany(
+                f"INSERT INTO {self.db.tbName} ({','.join(columns)}) VALUES ({placeholders})", values)
+        return len(values)
+
+    def _assign_registration_numbers(self, rows):
+        """
+        Reserves one block of registration numbers per category for the rows without one,
+        after marking the numbers given in the file as used.
+        """
+        by_category = {}
+        for fields in rows:
+            if fields.get(RegistrationNumber.columnName):
+                RegistrationNumber.reserve(self.db, fields[RegistrationNumber.columnName])
+            else:
+                birth_year = int(fields['dtNascimento'][-4:])
+                by_category.setdefault(self.current_year - birth_year, []).append(fields)
+
+        for category, category_rows in by_category.items():
+            first = RegistrationNumber.allocate(self.db, self.current_year, category, len(category_rows))
+            for offset, fields in enumerate(category_rows):
+                fields[RegistrationNumber.columnName] = RegistrationNumber.format(self.current_year, category, first + offset)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Usage:
+        python -m app.BulkImport elenco.csv [--db athlete.db] [--table athletes]
+    """
+    app_config, _ = AppConfigManager().loadConfig()
+
+    parser = argparse.ArgumentParser(description="Importa atletas de um arquivo CSV ou XLSX.")
+    parser.add_argument('file', help="arquivo .csv ou .xlsx com uma coluna por campo do cadastro")
+    parser.add_argument('--db', default=app_config.database_file, help="arquivo do banco de dados")
+    parser.add_argument('--table', default=app_config.database_table_name or 'athletes', help="nome da tabela")
+    parser.add_argument('--chunk-size', type=int, default=500, help="linhas por transação")
+    args = parser.parse_args(argv)
+
+    db = ConnectDB.from_config(app_config, args.db)
+    db.createTable(args.table)
+    try:
+        inserted, errors = AthleteImporter(db, chunk_size=args.chunk_size).import_file(args.file)
+    finally:
+        db.close_db()
+
+    for line, message in errors:
+        print(f"Line {line}: {message}")
+    print(f"{inserted} athletes imported, {len(errors)} errors.")
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,11 @@ from io import BytesIO
 from datetime import datetime
 import logging
 
+from .AthleteRecord import AthleteRecord
+from .RegistrationNumber import RegistrationNumber
+from .PhotoProcessor import PhotoProcessor
+from .PdfCompressor import PdfCompressor
+
 class BusinessLogic:
     def __init__(self, db_connection):
         """
@@ -13,6 +18,8 @@ class BusinessLogic:
             db_connection: A database connection object.
         """
         self.db = db_connection
+        self.photo_processor = PhotoProcessor()
+        self.pdf_compressor = PdfCompressor()
 
     def fetch_athlete_data(self, athlete_id):
         """
@@ -22,7 +29,8 @@ class BusinessLogic:
             athlete_id (int): The ID of the athlete to fetch data for.
 
         Returns:
-            dict: A dictionary containing the athlete's data, with images and dates processed.
+            AthleteRecord: A mapping with the athlete's data, with dates processed. The photo
+            and documents are only read when accessed; the photo is decoded into an Image.
         """
         try:
             data = self.db.readById(athlete_id)
@@ -33,12 +41,27 @@ class BusinessLogic:
         if not data:
             return {}  # Return an empty dictionary if no data is found
 
+        athlete_data = self.record_fields(data)
+
+        # Photo and documents are read from the attachments table on first access
+        return AthleteRecord(self.db.attachments, athlete_id, athlete_data,
+                             self.db.attachments.kinds(athlete_id),
+                             converters={'foto': self._process_image, 'foto_thumb': self._process_image})
+
+    def record_fields(self, data):
+        """
+        Maps a row read by ConnectDB.readById to the athlete's column values.
+
+        Args:
+            data (tuple): The row, with the id as first column.
+
+        Returns:
+            dict: The non-null column values, with dates processed.
+        """
         athlete_data = {}
         for k, value in zip(self.db.keys, data[1:]):  # Assuming self.db.keys are the column names
             if value is not None:
-                if k == 'foto':
-                    athlete_data[k] = self._process_image(value)
-                elif isinstance(value, datetime):
+                if isinstance(value, datetime):
                     athlete_data[k] = self._format_date(value)
                 else:
                     athlete_data[k] = value
@@ -68,56 +91,107 @@ class BusinessLogic:
             logging.warning("No data provided to update.")
             return False
 
-        columns = data.keys()
-        values = list(data.values())
-        set_clause = ', '.join([f"{col} = ?" for col in columns])
-
-        update_query = f"UPDATE athletes SET {set_clause} WHERE id = ?"
-        values.append(athlete_id)
-
         try:
-            self.db.cursor().execute(update_query, values)
-            self.db.commit()
+            statement = self.db.statements.update(data, keep_unset=False)
+            with self.db.transaction() as conn:
+                conn.execute(statement.sql, statement.parameters(data, athlete_id))
             return True
         except Exception as e:
             logging.error(f"Error updating athlete data: {e}")
-            self.db.rollback()
             return False
 
+    def _split_attachments(self, fields):
+        """
+        Separates the attachment fields from the column fields, and compresses the
+        documents and normalizes the photo. This is slow, so it is done before the
+        write transaction is opened.
+        """
+        attachments = {kind: fields.pop(kind) for kind in self.db.attachment_keys if kind in fields}
+
+        for kind in ('rg_pdf', 'atestado_pdf', 'autorizacao_pdf'):
+            if attachments.get(kind) is not None:
+                attachments[kind] = self.pdf_compressor.compress(attachments[kind])
+
+        if attachments.get('foto') is not None:
+            attachments['foto'], attachments['foto_thumb'] = self._normalize_photo(attachments['foto'])
+        return fields, attachments
+
+    def _store_attachments(self, athlete_id, attachments):
+        """Stores the attachments prepared by _split_attachments; None means unchanged."""
+        if attachments.get('foto') is not None and attachments.get('foto_thumb') is None:
+            # Do not keep the thumbnail of the previous photo
+            self.db.attachments.remove(athlete_id, 'foto_thumb')
+
+        for kind, value in attachments.items():
+            if value is not None:
+                self.db.attachments.put(athlete_id, kind, value)
+
+    def _normalize_photo(self, image_data):
+        """Crops the photo to the 3x4 print size and builds its thumbnail; the thumbnail is None if the data is not an image."""
+        try:
+            return self.photo_processor.process(bytes(image_data))
+        except Exception as e:
+            logging.error(f"Error processing photo, storing it unchanged: {e}")
+            return image_data, None
+
     def insert_row(self, **kwargs):
         """
         Insert a new row into the database with the provided values.
+        Photo and documents are written to the attachments table in the same transaction,
+        and an athlete without a registration number gets the next one of its category.
+
+        Returns:
+            int or bool: The ID of the inserted row, or False if the insertion failed.
+
+        Raises:
+            ValueError: If a field is not a column of the table, or the birth year is invalid.
         """
-        columns = ','.join(kwargs.keys())
-        values = tuple(kwargs.values())
-        placeholders = ','.join(['?' for _ in kwargs])
-        query = f"INSERT INTO {self.db.tbName} ({columns}) VALUES ({placeholders})"
+        kwargs, attachments = self._split_attachments(kwargs)
         try:
-            self.db.cursor.execute(query, values)
-            self.db.commit_db()
+            # The registration number is reserved in the transaction of the insert,
+            # so a failed insert gives it back
+            with self.db.transaction() as conn:
+                self._assign_registration_number(kwargs)
+                statement = self.db.statements.insert(kwargs)
+                row_id = conn.execute(statement.sql, statement.parameters(kwargs)).lastrowid
+                self._store_attachments(row_id, attachments)
             logging.info("Data inserted successfully.")
-            return True
+            return row_id
         except sqlite3.IntegrityError as e:
             logging.error(f"Insertion Error: {e}")
             return False
 
+    def _assign_registration_number(self, fields):
+        """Reserves the registration number of a new athlete that has a birth date but no number."""
+        column = RegistrationNumber.columnName
+        if fields.get(column) or not fields.get('dtNascimento'):
+            return
+        birth_year = datetime.strptime(fields['dtNascimento'], "%d/%m/%Y").year
+        fields[column] = RegistrationNumber(self.db, None, birth_year, datetime.now().year).registration_number
+
     def update_row(self, row_id, **kwargs):
         """
-        Update a row in the database with the provided values.
+        Update a row in the database with the provided values; None leaves a column unchanged.
+        Photo and documents are written to the attachments table in the same transaction.
+
+        Raises:
+            ValueError: If a field is not a column of the table.
         """
-        columns = ','.join([f"{col} = ?" for col in kwargs.keys() if kwargs[col] is not None])
-        values = [kwargs[col] for col in kwargs.keys() if kwargs[col] is not None]
-        values.append(row_id)
-    
-        if not columns:
+        kwargs, attachments = self._split_attachments(kwargs)
+        has_values = any(value is not None for value in kwargs.values())
+
+        if not has_values and not any(value is not None for value in attachments.values()):
             logging.error("No columns provided for update.")
             return False
-    
-        query = f"UPDATE {self.db.tbName} SET {columns} WHERE id = ?"
-    
+
+        # The same statement for every update of the same fields, whichever are None
+        statement = self.db.statements.update(kwargs) if has_values else None
+
         try:
-            self.db.cursor.execute(query, values)
-            self.db.commit_db()
+            with self.db.transaction() as conn:
+                if statement:
+                    conn.execute(statement.sql, statement.parameters(kwargs, row_id))
+                self._store_attachments(row_id, attachments)
             logging.info("Data updated successfully.")
             return True
         except sqlite3.IntegrityError as e:
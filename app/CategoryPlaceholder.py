@@ -0,0 +1,42 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt
+
+class CategoryPlaceholder(QWidget):
+    """
+    A lightweight stand-in for the table of a category that has not been opened yet.
+
+    It only knows the category name and how many athletes it has; AtletasApp replaces
+    it with an AtletasTableWidget the first time its tab is selected.
+
+    Args:
+        category (str): The category name.
+        count (int): The number of athletes in the category.
+        parent (QWidget, optional): The parent widget.
+
+    Usage:
+    >>> placeholder = CategoryPlaceholder('sub-13', 42)
+    >>> tab_widget.addTab(placeholder, 'sub-13 (42)')
+    """
+
+    def __init__(self, category, count, parent=None):
+        super().__init__(parent)
+        self.category_name = category
+        self.label = QLabel(self)
+        self.label.setAlignment(Qt.AlignCenter)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.label)
+        self.set_count(count)
+
+    def set_count(self, count):
+        """
+        Update the number of athletes of the category.
+
+        Args:
+            count (int): The number of athletes.
+        """
+        self.count = count
+        self.label.setText(f"{count} atleta(s) em {self.category_name}. Carregando...")
+
+    def get_row_count(self):
+        """Get the number of athletes of the category."""
+        return self.count
@@ -0,0 +1,203 @@
+import os
+from datetime import date
+
+import numpy as np
+
+from .formularioPDF import FormularioPDF
+from .paths import path
+from .utils import adjusted_ages
+
+class CategoryTable:
+    """
+    The category of every birth year of a season, compiled by CategoryRules.
+
+    Categorizing an athlete is an array lookup by birth year; no age is computed.
+
+    Args:
+        season (int): The season year the ages are counted in.
+        names (numpy.ndarray): The category names, the first one for birth year season - len(names) + 1
+            and the last one for the season year itself.
+
+    Usage:
+    >>> table = CategoryRules.from_file().table(even=True)
+    >>> table[2012]
+    'sub-14'
+    >>> table.lookup([2012, 2016])
+    array(['sub-14', 'initiation'], dtype='<U10')
+    """
+
+    def __init__(self, season, names):
+        self.season = season
+        self.first_year = season - len(names) + 1
+        self.names = names
+
+    def __getitem__(self, birth_year):
+        return str(self.lookup([birth_year])[0])
+
+    def lookup(self, birth_years):
+        """
+        Get the categories of many birth years at once.
+
+        Args:
+            birth_years (sequence): The birth years, as integers.
+
+        Returns:
+            numpy.ndarray: The category names, in the order of birth_years.
+
+        Raises:
+            ValueError: If a birth year is not an integer or is outside the season table.
+        """
+        years = np.asarray(birth_years)
+        if years.size and years.dtype.kind not in 'iu':
+            raise ValueError("Birth years must be integers")
+        offsets = years.astype(int) - self.first_year
+        if np.any((offsets < 0) | (offsets >= len(self.names))):
+            raise ValueError("Birth year outside the %d season: %s" % (
+                self.season, ', '.join(str(y) for y in years[(offsets < 0) | (offsets >= len(self.names))][:5])))
+        return self.names[offsets]
+
+class CategoryRules:
+    """
+    The age category rules of categories.yaml, with optional overrides per league.
+
+    The rules of a league (age cutoffs, rounding and season start) are compiled into
+    a CategoryTable, from birth year to category name, the first time they are used
+    in a season. The tables of every league are kept, so switching between leagues
+    does not recompute them. Rules read with from_file are cached per file and
+    reloaded when the file modification time changes.
+
+    Args:
+        configuration (dict): The parsed YAML rules.
+
+    Example:
+        rules = CategoryRules.from_file()
+        table = rules.table('Liga Metropolitana', even=True)
+        categories = table.lookup(birth_years)
+    """
+
+    # Rules used when categories.yaml is missing, the same as utils.getCat
+    DEFAULT_RULES = {
+        'next_season_from': None,
+        'rounding': None,
+        'name_format': 'sub-{age}',
+        'cutoffs': [{'max_age': 10, 'name': 'initiation'}],
+    }
+
+    # Birth years covered by each table, counted back from the season year
+    max_age = 120
+
+    _cache = {}
+
+    def __init__(self, configuration):
+        configuration = dict(configuration or {})
+        leagues = configuration.pop('leagues', None) or {}
+        self.default = self._validate(dict(self.DEFAULT_RULES, **configuration), 'default')
+        self.leagues = {str(name): self._validate(dict(self.default, **(rules or {})), name)
+                        for name, rules in leagues.items()}
+        self._tables = {}
+
+    @classmethod
+    def from_file(cls, file_name=os.path.join(path.yaml, 'categories.yaml')):
+        """
+        Get the rules of a YAML file, parsing it only if it changed since the last call.
+
+        Args:
+            file_name (str, optional): Path to the YAML rules. Defaults to data/yml/categories.yaml.
+
+        Returns:
+            CategoryRules: The rules, or the default rules if the file could not be read.
+        """
+        try:
+            mtime = os.path.getmtime(file_name)
+        except OSError:
+            print(f"The file '{file_name}' was not found, using the default category rules.")
+            mtime = None
+
+        cached = cls._cache.get(file_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        configuration = FormularioPDF.read_yaml_configuration(file_name) if mtime is not None else None
+        try:
+            rules = cls(configuration)
+        except ValueError as e:
+            print(f"Invalid category rules in '{file_name}': {e}. Using the default rules.")
+            rules = cls(None)
+        cls._cache[file_name] = (mtime, rules)
+        return rules
+
+    @staticmethod
+    def _validate(rules, name):
+        """Check the rules of a league and normalize the cutoffs, from the youngest age up."""
+        if rules.get('rounding') not in (None, 'even', 'odd', 'none'):
+            raise ValueError(f"{name}: rounding must be even, odd or none")
+        try:
+            rules['cutoffs'] = sorted(((int(c['max_age']), str(c['name'])) for c in rules.get('cutoffs') or []))
+            rules['name_format'].format(age=0)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise ValueError(f"{name}: invalid cutoffs or name_format ({e})")
+        if rules.get('next_season_from'):
+            try:
+                day, month = (int(part) for part in str(rules['next_season_from']).split('/'))
+                date(2000, month, day)
+            except ValueError:
+                raise ValueError(f"{name}: next_season_from must be dd/mm")
+            rules['next_season_from'] = (month, day)
+        return rules
+
+    def league_names(self):
+        """Get the names of the leagues with their own rules."""
+        return list(self.leagues)
+
+    def rules(self, league=None):
+        """Get the rules of a league, or the default rules if league is None or unknown."""
+        return self.leagues.get(league, self.default)
+
+    def season(self, league=None, today=None):
+        """
+        Get the season year the ages are counted in on a date.
+
+        Args:
+            league (str, optional): The league. Defaults to the default rules.
+            today (date, optional): The date. Defaults to today.
+
+        Returns:
+            int: The season year.
+        """
+        today = today or date.today()
+        next_season_from = self.rules(league)['next_season_from']
+        if next_season_from and (today.month, today.day) >= next_season_from:
+            return today.year + 1
+        return today.year
+
+    def table(self, league=None, even=True, today=None):
+        """
+        Get the birth year to category table of a league for the current season.
+
+        Args:
+            league (str, optional): The league. Defaults to the default rules.
+            even (bool, optional): Rounding used when the rules do not set one. Defaults to True.
+            today (date, optional): The date that decides the season. Defaults to today.
+
+        Returns:
+            CategoryTable: The compiled table, kept for later calls.
+        """
+        rules = self.rules(league)
+        rounding = {'even': True, 'odd': False, 'none': None}.get(rules['rounding'], even)
+        season = self.season(league, today)
+
+        key = (league if league in self.leagues else None, rounding, season)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._compile(rules, rounding, season)
+            self._tables[key] = table
+        return table
+
+    def _compile(self, rules, rounding, season):
+        """Name the categories of the birth years of a season."""
+        ages = adjusted_ages(np.arange(season - self.max_age, season + 1), even=rounding, year=season)
+        names = np.array([rules['name_format'].format(age=age) for age in ages.tolist()], dtype=object)
+        # From the oldest cutoff down, so the youngest one wins
+        for max_age, name in reversed(rules['cutoffs']):
+            names[ages <= max_age] = name
+        return CategoryTable(season, names.astype(str))
@@ -1,11 +1,24 @@
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.request import pathname2url
 from .paths import path
+from .AttachmentStore import AttachmentStore, ATTACHMENT_KINDS
+from .Migrations import Migrations
+from .SearchIndex import SearchIndex
+from .ArchiveStore import ArchiveStore
+from .StatementBuilder import StatementBuilder
 
 class ConnectDB:
     """
     A class for connecting to and interacting with an SQLite database.
 
+    The thread that creates the instance uses the main connection. Any other thread
+    that goes through conn, cursor or transaction gets a connection of its own, opened
+    on first use with the same connection profile and closed when the thread ends.
+    Background readers use read-only connections (see reading).
+
     Parameters:
         db_name (str): The name of the database file.
 
@@ -15,26 +28,84 @@ class ConnectDB:
     >>> db.commit_db()
     >>> data = db.readByColumn('nome')
     >>> record = db.readById(1)
+    >>> with db.transaction() as conn:
+    ...     conn.execute("UPDATE athletes SET is_active = 0 WHERE id = ?", (1,))
     >>> db.close_db()
     """
 
-    def __init__(self, db_name):
+    # Columns shown in the athletes listing
+    SUMMARY_COLUMNS = ('matricula', 'nome', 'dtNascimento', 'foneContato', 'foneResponsavel')
+
+    # Athletes shown in the listings; rows stored before is_active existed count as active
+    ACTIVE_CONDITION = "is_active IS NOT 0"
+
+    # Birth year of a dd/mm/yyyy dtNascimento, as stored by the registration dialog
+    BIRTH_YEAR_EXPRESSION = "CAST(substr(dtNascimento, -4) AS INTEGER)"
+
+    # Pragmas applied to every connection, by profile name.
+    # cache_size is in KiB when negative and mmap_size in bytes, as in SQLite.
+    CONNECTION_PROFILES = {
+        # Local disk: readers and the writer do not block each other, commits do not sync the WAL
+        'performance': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'cache_size': -64 * 1024,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+            'foreign_keys': 'ON',
+        },
+        # Database on a USB stick or network share, where WAL and mmap are not reliable
+        'safe': {
+            'journal_mode': 'DELETE',
+            'synchronous': 'FULL',
+            'cache_size': -16 * 1024,
+            'mmap_size': 0,
+            'temp_store': 'MEMORY',
+            'foreign_keys': 'ON',
+        },
+        # SQLite defaults, as before the profiles existed
+        'legacy': {},
+    }
+    DEFAULT_PROFILE = 'performance'
+
+    # Pragmas that only the main connection sets; they are persistent or need write access
+    MAIN_ONLY_PRAGMAS = ('journal_mode',)
+
+    def __init__(self, db_name, profile=DEFAULT_PROFILE, cache_size=None, mmap_size=None):
         """
         Initialize the ConnectDB instance and connect to the database.
 
         Parameters:
             db_name (str): The name of the database file.
+            profile (str, optional): The connection profile, a key of CONNECTION_PROFILES. Defaults to 'performance'.
+            cache_size (int, optional): Page cache size in KiB, overriding the profile.
+            mmap_size (int, optional): Memory-mapped I/O size in bytes, overriding the profile.
 
         Returns:
             ConnectDB: An instance of the ConnectDB class.
 
         Example:
         >>> db = ConnectDB('my_database.db')
+        >>> db = ConnectDB('//servidor/clube/athlete.db', profile='safe')
         """
+        self._main_conn = None
+        self._owner = threading.get_ident()
+        # Connection and cursor of the other threads, transaction depth of every thread
+        self._local = threading.local()
+        self._pragmas = {}
         try:
             # Connecting to the database
-            self.conn = sqlite3.connect(db_name)
-            self.cursor = self.conn.cursor()
+            self._main_conn = sqlite3.connect(db_name)
+            self._main_cursor = self._main_conn.cursor()
+            self.db_name = db_name
+            self.profile = self.apply_profile(profile, cache_size=cache_size, mmap_size=mmap_size)
+            # Binary documents are kept in their own table
+            self.attachments = AttachmentStore(self)
+            self.attachment_keys = list(ATTACHMENT_KINDS)
+            # Full-text index over the names and documents
+            self.search_index = SearchIndex(self)
+            # Former athletes, moved out of the main database
+            self.archive = ArchiveStore(self)
             # Printing the database name
             print("Database:", db_name)
             # Reading the SQLite version
@@ -46,6 +117,159 @@ class ConnectDB:
             print("Error opening the database.")
             return False
 
+    @classmethod
+    def from_config(cls, app_config, db_name=None):
+        """
+        Connect to the database with the connection profile of the application configuration.
+
+        Parameters:
+            app_config (AppConfig): The application configuration.
+            db_name (str, optional): The database file. Defaults to the configured one.
+
+        Returns:
+            ConnectDB: The connected database.
+
+        Usage:
+        >>> db = ConnectDB.from_config(app_config)
+        """
+        cache_mb = str(app_config.database_cache_mb).strip()
+        mmap_mb = str(app_config.database_mmap_mb).strip()
+        return cls(db_name or app_config.database_file,
+                   profile=app_config.database_profile or cls.DEFAULT_PROFILE,
+                   cache_size=int(cache_mb) * 1024 if cache_mb else None,
+                   mmap_size=int(mmap_mb) * 1024 * 1024 if mmap_mb else None)
+
+    def apply_profile(self, profile, cache_size=None, mmap_size=None):
+        """
+        Apply the pragmas of a connection profile to the main connection. The
+        connections opened later for other threads get them too.
+
+        Parameters:
+            profile (str): The profile name. Unknown names fall back to DEFAULT_PROFILE.
+            cache_size (int, optional): Page cache size in KiB, overriding the profile.
+            mmap_size (int, optional): Memory-mapped I/O size in bytes, overriding the profile.
+
+        Returns:
+            dict: The pragmas in effect, as reported back by SQLite.
+
+        Usage:
+        >>> db.apply_profile('safe')
+        """
+        if profile not in self.CONNECTION_PROFILES:
+            print("Unknown connection profile %s, using %s." % (profile, self.DEFAULT_PROFILE))
+            profile = self.DEFAULT_PROFILE
+
+        pragmas = dict(self.CONNECTION_PROFILES[profile])
+        if cache_size:
+            pragmas['cache_size'] = -abs(int(cache_size))
+        if mmap_size is not None:
+            pragmas['mmap_size'] = int(mmap_size)
+        self._pragmas = pragmas
+
+        in_effect = self._configure(self._main_conn, main=True)
+        if pragmas:
+            print("Connection profile %s: %s" % (profile, in_effect))
+        return in_effect
+
+    def _configure(self, conn, main=False):
+        """Apply the pragmas of the profile to a connection, returning the values in effect."""
+        in_effect = {}
+        for name, value in self._pragmas.items():
+            if not main and name in self.MAIN_ONLY_PRAGMAS:
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+            row = conn.execute(f"PRAGMA {name}").fetchone()
+            in_effect[name] = row[0] if row else None
+        return in_effect
+
+    @property
+    def conn(self):
+        """
+        The connection of the calling thread.
+
+        The main connection on the thread that created the instance; on any other
+        thread, a connection of its own, opened on first use.
+        """
+        if threading.get_ident() == self._owner or self._main_conn is None:
+            return self._main_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_name)
+            self._configure(conn)
+            self._local.conn = conn
+        return conn
+
+    @property
+    def cursor(self):
+        """
+        The cursor of the calling thread, on its connection.
+
+        Prefer conn.execute, which returns a cursor of its own, where the results of a
+        query must survive another query.
+        """
+        if threading.get_ident() == self._owner or self._main_conn is None:
+            return self._main_cursor
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            cursor = self._local.cursor = self.conn.cursor()
+        return cursor
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run statements in a single write transaction on the connection of the calling thread.
+
+        The transaction is committed when the block ends and rolled back if it raises.
+        It starts with BEGIN IMMEDIATE, so a conflicting writer is waited for up front
+        instead of failing midway. A transaction inside another one joins it.
+
+        Yields:
+            sqlite3.Connection: The connection to run the statements on.
+
+        Raises:
+            sqlite3.Error: If the transaction cannot be started or committed.
+
+        Usage:
+        >>> with db.transaction() as conn:
+        ...     conn.execute(sql, values)
+        """
+        conn = self.conn
+        if getattr(self._local, 'in_transaction', False):
+            # Nested: the outermost transaction commits or rolls back
+            yield conn
+            return
+
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        self._local.in_transaction = True
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            self._local.in_transaction = False
+
+    @contextmanager
+    def reading(self):
+        """
+        Open a read-only connection for the duration of a block, see open_reader.
+
+        Yields:
+            sqlite3.Connection: The read-only connection, closed when the block ends.
+
+        Usage:
+        >>> with db.reading() as conn:
+        ...     rows = conn.execute(sql).fetchall()
+        """
+        conn = self.open_reader()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
     def commit_db(self):
         """
         Commit changes to the database.
@@ -58,19 +282,22 @@ class ConnectDB:
 
     def close_db(self):
         """
-        Close the database connection.
+        Close the main database connection.
 
         Usage:
         >>> db.close_db()
         """
-        if self.conn:
-            self.conn.close()
+        if self._main_conn:
+            self._main_conn.close()
             print("Connection closed.")
 
     def createTable(self, tbName, schema_name=os.path.join(path.sql,'tableScheme.sql')):
         """
         Create a table in the database based on a schema file.
 
+        The pending schema migrations (see Migrations) are applied afterwards, also
+        when the table already exists.
+
         Parameters:
             tbName (str): The name of the table to create.
             schema_name (str, optional): The name of the schema file. Defaults to 'sql/table_body'.
@@ -85,6 +312,14 @@ class ConnectDB:
         with open(self.tbScheme, 'r') as f:
             self.keys = [line.split(" ")[0] for line in f]
         f.close()
+        # INSERT and UPDATE statements of the table, built once per column set
+        self.statements = StatementBuilder(self.tbName, self.keys)
+
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (self.tbName,)).fetchone()
+        if exists:
+            Migrations(self, self.tbName).run()
+            return False
 
         print("Creating table %s ..." % self.tbName)
 
@@ -100,16 +335,21 @@ class ConnectDB:
             sqliteTable += ');'
 
             self.cursor.executescript(sqliteTable)
+            print("Table %s created successfully." % self.tbName)
+            created = True
 
-        except sqlite3.Error:
-            print("Warning: Table %s already exists." % self.tbName)
-            return False
+        except sqlite3.Error as e:
+            print("Error creating table %s: %s" % (self.tbName, e))
+            created = False
+
+        Migrations(self, self.tbName).run()
 
-        print("Table %s created successfully." % self.tbName)
+        return created
 
     def readByColumn(self, Column='nome'):
         """
         Retrieve data from the table ordered by a specified column.
+        Attachments are not included; use the AttachmentStore to read them.
 
         Parameters:
             Column (str, optional): The column by which to order the data. Defaults to 'nome'.
@@ -120,16 +360,43 @@ class ConnectDB:
         Usage:
         >>> data = db.readByColumn('nome')
         """
-        sql = f"SELECT * FROM {self.tbName} ORDER BY {Column}"
+        sql = f"SELECT id, {', '.join(self.keys)} FROM {self.tbName} ORDER BY {Column}"
         r = self.cursor.execute(sql)
         return r.fetchall()
 
-    def readById(self, id_value):
+    def open_reader(self):
+        """
+        Open a read-only connection to the database, for reading on a worker thread.
+
+        The connection is independent of the main one, has the pragmas of the connection
+        profile and may be used by a thread other than the one that opened it; the caller
+        closes it, or uses reading instead.
+
+        Returns:
+            sqlite3.Connection: The read-only connection.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened.
+
+        Usage:
+        >>> conn = db.open_reader()
+        >>> conn.execute(sql).fetchall()
+        >>> conn.close()
+        """
+        uri = 'file:%s?mode=ro' % pathname2url(os.path.abspath(self.db_name))
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._configure(conn)
+        return conn
+
+    def readById(self, id_value, conn=None):
         """
         Retrieve a record from the table by its ID.
+        Attachments are not included; use the AttachmentStore to read them.
 
         Parameters:
             id_value (int): The ID of the record to retrieve.
+            conn (sqlite3.Connection, optional): The connection to read with, such as one
+                from open_reader. Defaults to the main connection.
 
         Returns:
             tuple: A tuple representing the record.
@@ -138,7 +405,157 @@ class ConnectDB:
         >>> record = db.readById(1)
         """
         # Query the database based on the ID
-        sql = f"SELECT * FROM {self.tbName} WHERE id=?"
-        r = self.cursor.execute(sql, (id_value,))
+        sql = f"SELECT id, {', '.join(self.keys)} FROM {self.tbName} WHERE id=?"
+        r = (conn or self.conn).execute(sql, (id_value,))
         return r.fetchone()
 
+    def birth_year_column(self):
+        """
+        Get the SQL for the birth year of an athlete.
+
+        Returns:
+            str: The generated birth_year column, or the expression it is computed from
+            on SQLite versions without generated columns.
+        """
+        columns = [row[1] for row in self.conn.execute(f"PRAGMA table_xinfo({self.tbName})")]
+        return 'birth_year' if 'birth_year' in columns else self.BIRTH_YEAR_EXPRESSION
+
+    def birth_year_counts(self):
+        """
+        Count the active athletes of each birth year, from the birth_year index.
+
+        Returns:
+            list: (birth_year, count) tuples ordered by birth year.
+
+        Usage:
+        >>> counts = db.birth_year_counts()
+        """
+        column = self.birth_year_column()
+        sql = (f"SELECT {column}, count(*) FROM {self.tbName} WHERE {self.ACTIVE_CONDITION}"
+               f" GROUP BY {column} ORDER BY {column}")
+        return self.conn.execute(sql).fetchall()
+
+    def summary_query(self, columns=SUMMARY_COLUMNS, order_by='nome', birth_years=None, active=True):
+        """
+        Build the listing query of list_summary without running it, for readers that
+        fetch the rows on their own connection.
+
+        Parameters:
+            columns (sequence, optional): The columns to fetch. Defaults to SUMMARY_COLUMNS.
+            order_by (str, optional): The column by which to order the data. Defaults to 'nome'.
+            birth_years (tuple, optional): The first and last birth year of the athletes to fetch.
+                Defaults to all the athletes.
+            active (bool, optional): True for the active athletes only, False for the inactive
+                ones only, None for both. Defaults to True.
+
+        Returns:
+            tuple: The list of column names, the SQL and its parameters.
+
+        Raises:
+            ValueError: If a column is not part of the table schema.
+
+        Usage:
+        >>> column_names, sql, parameters = db.summary_query(birth_years=(2010, 2011))
+        """
+        unknown = [c for c in list(columns) + [order_by] if c != 'id' and c not in self.keys]
+        if unknown:
+            raise ValueError("Unknown column(s): %s" % ', '.join(unknown))
+
+        column_names = ['id'] + [c for c in columns if c != 'id']
+        conditions = []
+        parameters = ()
+        if active is not None:
+            conditions.append(self.ACTIVE_CONDITION if active else f"NOT ({self.ACTIVE_CONDITION})")
+        if birth_years is not None:
+            conditions.append(f"{self.birth_year_column()} BETWEEN ? AND ?")
+            parameters = tuple(birth_years)
+        sql = f"SELECT {', '.join(column_names)} FROM {self.tbName}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_by}"
+        return column_names, sql, parameters
+
+    def list_summary(self, columns=SUMMARY_COLUMNS, order_by='nome', birth_years=None, active=True):
+        """
+        Retrieve only the given columns of every active athlete, for listings.
+
+        The id is always returned as the first column. Attachments are never fetched.
+
+        Parameters:
+            columns (sequence, optional): The columns to fetch. Defaults to SUMMARY_COLUMNS.
+            order_by (str, optional): The column by which to order the data. Defaults to 'nome'.
+            birth_years (tuple, optional): The first and last birth year of the athletes to fetch.
+                Defaults to all the athletes.
+            active (bool, optional): True for the active athletes only, False for the inactive
+                ones only, None for both. Defaults to True.
+
+        Returns:
+            tuple: The list of column names and the list of rows.
+
+        Raises:
+            ValueError: If a column is not part of the table schema.
+
+        Usage:
+        >>> column_names, rows = db.list_summary(('matricula', 'nome'))
+        """
+        column_names, sql, parameters = self.summary_query(columns, order_by, birth_years, active)
+        r = self.conn.execute(sql, parameters)
+        return column_names, r.fetchall()
+
+    def set_athletes_active(self, ids, active, chunk_size=900):
+        """
+        Activate or deactivate athletes in a single transaction.
+
+        Deactivated athletes keep their data and attachments but leave the listings
+        and the search; the archive (see ArchiveStore) later moves them out of the
+        main database.
+
+        Parameters:
+            ids (iterable): The IDs of the athletes.
+            active (bool): The new state.
+            chunk_size (int, optional): IDs per UPDATE statement, below the SQLite
+                limit of bound parameters. Defaults to 900.
+
+        Returns:
+            int: The number of athletes updated.
+
+        Raises:
+            sqlite3.Error: If the update fails; nothing is changed then.
+
+        Usage:
+        >>> db.set_athletes_active([4, 8, 15], False)
+        """
+        ids = list(ids)
+        updated = 0
+        with self.transaction() as conn:
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start:start + chunk_size]
+                placeholders = ', '.join('?' * len(chunk))
+                updated += conn.execute(
+                    f"UPDATE {self.tbName} SET is_active = ? WHERE id IN ({placeholders})",
+                    [int(bool(active))] + chunk).rowcount
+        return updated
+
+    def read_summary(self, id_value, columns=SUMMARY_COLUMNS):
+        """
+        Retrieve the listing columns of a single active athlete.
+
+        Parameters:
+            id_value (int): The ID of the record to retrieve.
+            columns (sequence, optional): The columns to fetch. Defaults to SUMMARY_COLUMNS.
+
+        Returns:
+            tuple or None: The row, with the id as first column, or None if it does not exist
+            or is not active.
+
+        Usage:
+        >>> row = db.read_summary(1)
+        """
+        unknown = [c for c in columns if c != 'id' and c not in self.keys]
+        if unknown:
+            raise ValueError("Unknown column(s): %s" % ', '.join(unknown))
+
+        column_names = ['id'] + [c for c in columns if c != 'id']
+        sql = f"SELECT {', '.join(column_names)} FROM {self.tbName} WHERE id=? AND {self.ACTIVE_CONDITION}"
+        r = self.conn.execute(sql, (id_value,))
+        return r.fetchone()
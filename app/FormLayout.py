@@ -0,0 +1,95 @@
+import os
+
+from .formularioPDF import FormularioPDF
+
+class FormLayout:
+    """
+    A compiled form.yaml layout.
+
+    The YAML is parsed once and its blocks are flattened into a draw list of field
+    offsets relative to the origin of the form. Filling in a form then only binds the
+    athlete values to that list. Layouts read with from_file are cached per file and
+    reloaded when the file modification time changes.
+
+    Args:
+        configuration (list): The parsed YAML configuration, one dictionary per block.
+        cm_to_points (float, optional): Conversion factor from centimeters to points. Defaults to 28.35.
+
+    Example:
+        layout = FormLayout.from_file('data/yml/form.yaml')
+        formulario_pdf.draw_form_layout(x, y, layout, athlete_data, block_spacing)
+    """
+
+    _cache = {}
+
+    def __init__(self, configuration, cm_to_points=28.35):
+        self.cm_to_points = cm_to_points
+        self._draw_lists = {}
+
+        # (block_name, first_line, last_line, [(dx, line, width, label, key), ...])
+        self.blocks = []
+        for block in configuration:
+            fields = []
+            lines = [line_info['line'] for line_info in block['lines']]
+            for line_info in block['lines']:
+                dx = 0
+                for field in line_info['fields']:
+                    width = field['width'] * cm_to_points
+                    fields.append((dx, line_info['line'], width, field['label'], field.get('key')))
+                    dx += width
+            self.blocks.append((block['block_name'], lines[0], lines[-1], fields))
+
+    @classmethod
+    def from_file(cls, file_name):
+        """
+        Get the compiled layout of a YAML file, parsing it only if it changed since the last call.
+
+        Args:
+            file_name (str): Path to the YAML layout.
+
+        Returns:
+            FormLayout or None: The compiled layout, or None if the file could not be read.
+        """
+        try:
+            mtime = os.path.getmtime(file_name)
+        except OSError:
+            print(f"The file '{file_name}' was not found.")
+            return None
+
+        cached = cls._cache.get(file_name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        configuration = FormularioPDF.read_yaml_configuration(file_name)
+        if configuration is None:
+            return None
+        layout = cls(configuration)
+        cls._cache[file_name] = (mtime, layout)
+        return layout
+
+    def draw_list(self, line_height, field_height, block_spacing):
+        """
+        Get the positions of all the blocks and fields, relative to the origin of the form.
+
+        The list is computed once per combination of sizes and kept by the layout.
+
+        Args:
+            line_height (float): Distance between the lines of a block, in points.
+            field_height (float): Height of each field, in points.
+            block_spacing (float): Distance between the tops of two consecutive blocks, in points.
+
+        Returns:
+            tuple: The blocks as (block_name, dy, label_height, fields), each field as
+            (dx, dy, width, height, label, key).
+        """
+        sizes = (line_height, field_height, block_spacing)
+        draw_list = self._draw_lists.get(sizes)
+        if draw_list is None:
+            draw_list = tuple(
+                (block_name, -index * block_spacing, (last_line - first_line) * line_height,
+                 tuple((dx, -index * block_spacing - (line - 1) * line_height, width, field_height, label, key)
+                       for dx, line, width, label, key in fields))
+                for index, (block_name, first_line, last_line, fields) in enumerate(self.blocks))
+            self._draw_lists[sizes] = draw_list
+        return draw_list
+
@@ -0,0 +1,98 @@
+import os
+import math
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+class ImageCache:
+    """
+    A process-wide cache of the images drawn by the PDF generators (logos and headers).
+
+    Each image is decoded once and, when drawn smaller than its pixel size, scaled down
+    to the resolution it is printed at. The resulting ImageReader objects are kept per
+    path, modification time and target size, so replacing a logo file is picked up
+    on the next form.
+
+    Example:
+        width, height = ImageCache.size('logo.png')
+        logo = ImageCache.get('logo.png', height=80)
+        canvas.drawImage(logo, x, y, width=width * 80 / height, height=80, mask='auto')
+    """
+
+    dpi = 300
+    _sizes = {}
+    _readers = {}
+
+    @classmethod
+    def size(cls, image_path):
+        """
+        Get the pixel size of an image file, reading only its header.
+
+        Args:
+            image_path (str): The path to the image file.
+
+        Returns:
+            tuple: Width and height of the image, in pixels.
+        """
+        mtime = os.path.getmtime(image_path)
+        cached = cls._sizes.get(image_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with Image.open(image_path) as img:
+            image_size = img.size
+        cls._sizes[image_path] = (mtime, image_size)
+        return image_size
+
+    @classmethod
+    def get(cls, image_path, width=None, height=None):
+        """
+        Get a decoded image, scaled down to the size it is drawn at.
+
+        Args:
+            image_path (str): The path to the image file.
+            width (float, optional): The drawn width, in points.
+            height (float, optional): The drawn height, in points. If neither is given,
+                the image is kept at its original size.
+
+        Returns:
+            ImageReader: The image, ready to be drawn on any canvas.
+        """
+        mtime = os.path.getmtime(image_path)
+        source_size = cls.size(image_path)
+        pixel_size = cls._pixel_size(source_size, width, height)
+
+        key = (image_path, mtime, pixel_size)
+        reader = cls._readers.get(key)
+        if reader is None:
+            with Image.open(image_path) as img:
+                img.load()
+                if pixel_size != source_size:
+                    img = img.resize(pixel_size, Image.LANCZOS)
+            reader = ImageReader(img)
+
+            # Forget the versions of a file that has since been replaced
+            for stale in [k for k in cls._readers if k[0] == image_path and k[1] != mtime]:
+                del cls._readers[stale]
+            cls._readers[key] = reader
+        return reader
+
+    @classmethod
+    def _pixel_size(cls, source_size, width, height):
+        """Pixel size needed to print the image at the given size in points, never larger than the source."""
+        source_width, source_height = source_size
+        if width is not None:
+            scale = width * cls.dpi / 72 / source_width
+        elif height is not None:
+            scale = height * cls.dpi / 72 / source_height
+        else:
+            return source_size
+        if scale >= 1:
+            return source_size
+        return (max(1, math.ceil(source_width * scale)), max(1, math.ceil(source_height * scale)))
+
+    @classmethod
+    def clear(cls):
+        """Forget all the cached images."""
+        cls._sizes.clear()
+        cls._readers.clear()
@@ -0,0 +1,122 @@
+import sqlite3
+
+from .AttachmentStore import ATTACHMENT_KINDS
+from .RegistrationNumber import RegistrationNumber
+
+class Migrations:
+    """
+    Versioned schema migrations of the athletes database.
+
+    The version of the database is kept in PRAGMA user_version. Each migration brings
+    the schema from the previous version to its own and is applied only once, in order;
+    the version is stored right after each migration succeeds. New schema changes are
+    added at the end of MIGRATIONS with the next version number, never by editing an
+    existing entry.
+
+    Parameters:
+        db (ConnectDB): The database connection object.
+        table_name (str): The name of the athletes table.
+
+    Example:
+    >>> Migrations(db, 'athletes').run()
+    """
+
+    def __init__(self, db, table_name):
+        """
+        Initialize the Migrations instance.
+
+        Parameters:
+            db (ConnectDB): The database connection object.
+            table_name (str): The name of the athletes table.
+        """
+        self.db = db
+        self.table_name = table_name
+
+    @property
+    def version(self):
+        """The schema version stored in the database."""
+        return self.db.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def run(self):
+        """
+        Apply the pending migrations.
+
+        Returns:
+            int: The schema version after the run. A failed migration is rolled back and
+            stops the run, so the database stays at the last version that succeeded.
+
+        Usage:
+        >>> version = Migrations(db, 'athletes').run()
+        """
+        current = self.version
+        for version, description, migrate in self.MIGRATIONS:
+            if version <= current:
+                continue
+
+            print("Migrating %s to version %d: %s ..." % (self.table_name, version, description))
+            try:
+                migrate(self)
+                self.db.conn.execute(f"PRAGMA user_version = {version}")
+                self.db.conn.commit()
+            except sqlite3.Error as e:
+                self.db.conn.rollback()
+                print("Error migrating to version %d: %s" % (version, e))
+                break
+            current = version
+        return current
+
+    # Migrations ------------------------------------------------------------
+
+    def _attachments(self):
+        # Documents kept out of the athletes table, shared by content.
+        # Errors propagate, so the version is only stored once nothing is left behind.
+        self.db.attachments.createTable(self.table_name)
+        self.db.attachments.migrate(self.table_name)
+        columns = [row[1] for row in self.db.conn.execute(f"PRAGMA table_info({self.table_name})")]
+        for kind in ATTACHMENT_KINDS:
+            if kind in columns and self.db.conn.execute(
+                    f"SELECT 1 FROM {self.table_name} WHERE {kind} IS NOT NULL AND length({kind}) > 0 LIMIT 1").fetchone():
+                raise sqlite3.DatabaseError(f"attachments left in column {kind}")
+
+    def _registration_sequence(self):
+        RegistrationNumber.createTable(self.db, self.table_name)
+
+    def _indexes(self):
+        table = self.table_name
+        unique = self.db.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (f"{table}_{RegistrationNumber.columnName}_unique",)).fetchone()
+        if not unique:
+            # Duplicated registration numbers prevented the unique index
+            self.db.conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_matricula ON {table} (matricula)")
+        self.db.conn.executescript(f'''
+            CREATE INDEX IF NOT EXISTS {table}_dtNascimento ON {table} (dtNascimento);
+            CREATE INDEX IF NOT EXISTS {table}_nome_nocase ON {table} (nome COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS {table}_is_active ON {table} (is_active);
+            ANALYZE {table};
+        ''')
+
+    def _birth_year(self):
+        table = self.table_name
+        try:
+            # Virtual: computed on read, only the index stores it
+            self.db.conn.execute(
+                f"ALTER TABLE {table} ADD COLUMN birth_year INTEGER "
+                f"GENERATED ALWAYS AS ({self.db.BIRTH_YEAR_EXPRESSION}) VIRTUAL")
+        except sqlite3.OperationalError as e:
+            # SQLite < 3.31 has no generated columns, index the expression itself
+            print("Generated column not supported (%s), indexing the expression." % e)
+        self.db.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_birth_year ON {table} ({self.db.birth_year_column()})")
+
+    def _search_index(self):
+        # Without FTS5 the search falls back to filtering the loaded tables
+        self.db.search_index.createTable(self.table_name)
+
+    MIGRATIONS = [
+        (1, "attachments table", _attachments),
+        (2, "registration number sequence", _registration_sequence),
+        (3, "indexes on matricula, dtNascimento, nome and is_active", _indexes),
+        (4, "birth_year column", _birth_year),
+        (5, "full-text search index", _search_index),
+    ]
@@ -0,0 +1,53 @@
+import logging
+
+import fitz  # PyMuPDF
+
+class PdfCompressor:
+    """
+    Shrinks scanned PDF documents before they are stored.
+
+    Scans of RG, medical certificates and authorizations are mostly full page images
+    at the scanner resolution. The embedded images above max_dpi are downsampled and
+    re-encoded as JPEG, and the file is rewritten with compressed streams. The result
+    is only kept if it is smaller than the original.
+
+    Args:
+        threshold (int, optional): Documents up to this size in bytes are kept as they are;
+            None disables the compression. Defaults to 512 KiB.
+        max_dpi (int, optional): Resolution the embedded images are reduced to. Defaults to 150.
+        quality (int, optional): JPEG quality of the re-encoded images. Defaults to 75.
+
+    Example:
+        data = PdfCompressor().compress(open('rg.pdf', 'rb').read())
+    """
+
+    def __init__(self, threshold=512 * 1024, max_dpi=150, quality=75):
+        self.threshold = threshold
+        self.max_dpi = max_dpi
+        self.quality = quality
+
+    def compress(self, pdf_data):
+        """
+        Compress a PDF document.
+
+        Args:
+            pdf_data (bytes): The PDF file content.
+
+        Returns:
+            bytes: The compressed document, or pdf_data itself if it is small, not a PDF,
+            or could not be made smaller.
+        """
+        if self.threshold is None or len(pdf_data) <= self.threshold:
+            return pdf_data
+
+        try:
+            with fitz.open(stream=bytes(pdf_data), filetype='pdf') as doc:
+                if hasattr(doc, 'rewrite_images'):  # PyMuPDF >= 1.25
+                    doc.rewrite_images(dpi_threshold=self.max_dpi + 1, dpi_target=self.max_dpi, quality=self.quality)
+                # Keep the file ID, so the same scan always compresses to the same bytes and dedups
+                compressed = doc.tobytes(garbage=3, deflate=True, deflate_images=True, clean=True, no_new_id=True)
+        except Exception as e:
+            logging.error(f"Error compressing PDF, storing it unchanged: {e}")
+            return pdf_data
+
+        return compressed if len(compressed) < len(pdf_data) else pdf_data
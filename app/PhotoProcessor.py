@@ -0,0 +1,70 @@
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+class PhotoProcessor:
+    """
+    Normalizes the athlete photos before they are stored.
+
+    Photos picked from disk are often multi-megabyte phone pictures. They are cropped
+    to the 3x4 cm print size at the capture resolution of CameraWindow, re-encoded as
+    compact JPEG without EXIF metadata, and a small thumbnail is produced for the
+    dialogs, so that showing a photo never decodes the full picture.
+
+    Args:
+        width_cm (float, optional): Print width of the photo. Defaults to 3.
+        height_cm (float, optional): Print height of the photo. Defaults to 4.
+        dpi (int, optional): Print resolution. Defaults to 300.
+        thumbnail_size (tuple, optional): Size of the thumbnail in pixels. Defaults to (128, 170).
+        quality (int, optional): JPEG quality of the photo. Defaults to 85.
+
+    Example:
+        photo, thumbnail = PhotoProcessor().process(open('foto.jpg', 'rb').read())
+    """
+
+    def __init__(self, width_cm=3, height_cm=4, dpi=300, thumbnail_size=(128, 170), quality=85):
+        # Same rounding as CameraWindow.getCaptureWidthPixels/getCaptureHeightPixels
+        self.size = (int(width_cm * dpi / 2.54), int(height_cm * dpi / 2.54))
+        self.dpi = dpi
+        self.thumbnail_size = thumbnail_size
+        self.quality = quality
+
+    def process(self, image_data):
+        """
+        Normalize a photo and build its thumbnail.
+
+        Args:
+            image_data (bytes): The photo as read from the file or the camera, in any format PIL reads.
+
+        Returns:
+            tuple: The normalized JPEG photo and the JPEG thumbnail, as bytes.
+
+        Raises:
+            OSError: If the data is not an image.
+        """
+        with Image.open(BytesIO(image_data)) as img:
+            # Apply the camera orientation before the EXIF data is dropped
+            img = ImageOps.exif_transpose(img)
+            img = self._to_rgb(img)
+
+        photo = ImageOps.fit(img, self.size, Image.LANCZOS)
+        thumbnail = ImageOps.fit(photo, self.thumbnail_size, Image.LANCZOS)
+        return (self._encode(photo, self.quality, dpi=(self.dpi, self.dpi)),
+                self._encode(thumbnail, 80))
+
+    @staticmethod
+    def _to_rgb(img):
+        """Flatten transparency on white and convert to RGB, as JPEG has no alpha channel."""
+        if img.mode in ('RGBA', 'LA', 'P'):
+            img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel('A'))
+            return background
+        return img.convert('RGB')
+
+    @staticmethod
+    def _encode(img, quality, **options):
+        """Encode an image as an optimized JPEG, without metadata."""
+        buffer = BytesIO()
+        img.save(buffer, format='JPEG', quality=quality, optimize=True, **options)
+        return buffer.getvalue()
@@ -2,12 +2,14 @@ import os
 from reportlab.lib.pagesizes import A4
 
 from .formularioPDF import FormularioPDF
+from .FormLayout import FormLayout
 from .paths import path
 
 class RegistrationForm:
     """A class to create a registration form PDF for athletes."""
 
-    def __init__(self, header_text, form_filename="registration_form.pdf", papersize=A4, title='REGISTRATION FORM', logo=None):
+    def __init__(self, header_text, form_filename="registration_form.pdf", papersize=A4, title='REGISTRATION FORM', logo=None,
+                 form_layout=None):
         """
         Initializes a RegistrationForm object.
 
@@ -17,6 +19,8 @@ class RegistrationForm:
             papersize: (optional): Size of the PDF page, defaults to A4.
             title (str, optional): Title of the form. Defaults to 'REGISTRATION FORM'.
             logo (str, optional): Path to a logo file to be included in the form. Can be None if no logo is provided.
+            form_layout (FormLayout, optional): The compiled form layout. Defaults to the cached layout of
+                data/yml/form.yaml.
 
         Example usage:
             form = RegistrationForm("Registration Information", logo="logo.png")
@@ -27,6 +31,7 @@ class RegistrationForm:
         self.title = title
         self.logo = logo
         self.header_text = header_text
+        self.form_layout = form_layout
 
         self.formulario_pdf = FormularioPDF(self.form_filename, papersize=self.papersize)
 
@@ -69,11 +74,8 @@ class RegistrationForm:
 
        # all other fields
         pos_y = y - photo_height + 2*self.formulario_pdf.line_height
-        configuration = self.formulario_pdf.read_yaml_configuration(os.path.join(path.yaml,'form.yaml'))
-        field_info_list = self.formulario_pdf.build_field_info(configuration, athlete_data)
-        for block_name, field_info in field_info_list:
-            self.formulario_pdf.create_form_block(x, pos_y, field_info, block_name=block_name)
-            pos_y = pos_y - 5.5 * 0.9 * cm_to_points
+        layout = self.form_layout or FormLayout.from_file(os.path.join(path.yaml,'form.yaml'))
+        self.formulario_pdf.draw_form_layout(x, pos_y, layout, athlete_data, block_spacing=5.5 * 0.9 * cm_to_points)
 
 
         # include gender option
@@ -98,6 +100,21 @@ class RegistrationForm:
         self.formulario_pdf.canvas.save()
 
 
+    @staticmethod
+    def header_from_config(app_config):
+        """Builds the header text of the form from the club configuration.
+
+        Args:
+            app_config (AppConfig): The application configuration.
+
+        Returns:
+            str: The header text, with <br/> line breaks.
+        """
+        header_text = f"{app_config.nome}<br/>"
+        header_text += f"{app_config.rua}, {app_config.numero}, {app_config.cidade} - {app_config.uf}<br/>"
+        header_text += f"{app_config.fone_contato}"
+        return header_text
+
     @staticmethod
     def get_selected_gender(athlete_data):
         """Determines which gender radio button is checked.
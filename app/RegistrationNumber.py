@@ -3,6 +3,10 @@ class RegistrationNumber:
     """
     A class to generate sequential registration numbers for athletes based on their birth year.
 
+    The last index used for each (year, category) pair is kept in a small sequence table,
+    so a new number is obtained with a single keyed update instead of scanning the
+    athletes table. The update runs in the same transaction as the athlete insert.
+
     Attributes:
         db (object): Database connection object.
         config (object): Configuration object containing database settings.
@@ -11,6 +15,8 @@ class RegistrationNumber:
         registration_number (str): The next sequential registration number.
     """
     columnName = 'matricula'
+    sequenceTable = 'registration_sequence'
+
     def __init__(self, db, config, birth_year, current_year):
         """
         The constructor for RegistrationGenerator class.
@@ -32,6 +38,96 @@ class RegistrationNumber:
         self.current_year = current_year
         self.registration_number = self.generate_registration_number()
 
+    @classmethod
+    def createTable(cls, db, table_name):
+        """
+        Creates the sequence table and, when it is new, fills it from the registration
+        numbers already stored in the athletes table. Also makes the registration number
+        unique in the athletes table.
+
+        Args:
+            db (object): Database connection object.
+            table_name (str): The name of the athletes table.
+        """
+        exists = db.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (cls.sequenceTable,)).fetchone()
+
+        db.conn.execute(f'''CREATE TABLE IF NOT EXISTS {cls.sequenceTable} (
+                                year INTEGER NOT NULL,
+                                category INTEGER NOT NULL,
+                                last_index INTEGER NOT NULL,
+                                PRIMARY KEY (year, category))''')
+
+        if not exists:
+            column = cls.columnName
+            db.conn.execute(f'''INSERT INTO {cls.sequenceTable} (year, category, last_index)
+                                SELECT CAST(SUBSTR({column}, 1, 4) AS INTEGER),
+                                       CAST(SUBSTR({column}, 5, 2) AS INTEGER),
+                                       MAX(CAST(SUBSTR({column}, 7, 4) AS INTEGER))
+                                FROM {table_name}
+                                WHERE {column} GLOB '[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]'
+                                GROUP BY 1, 2''')
+        db.conn.commit()
+
+        try:
+            db.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table_name}_{cls.columnName}_unique "
+                            f"ON {table_name} ({cls.columnName})")
+        except sqlite3.IntegrityError:
+            print("Warning: duplicate registration numbers found in %s; unique index not created." % table_name)
+
+    @classmethod
+    def allocate(cls, db, year, category, count=1):
+        """
+        Reserves a block of consecutive indexes for a (year, category) pair.
+
+        The update opens a write transaction that is only committed together with the
+        inserts that use the numbers, so concurrent inserts cannot get the same index.
+
+        Args:
+            db (object): Database connection object.
+            year (int): The registration year.
+            category (int): The category (current year minus birth year).
+            count (int, optional): How many indexes to reserve. Defaults to 1.
+
+        Returns:
+            int: The first reserved index.
+        """
+        cursor = db.conn.cursor()
+        cursor.execute(f'''INSERT INTO {cls.sequenceTable} (year, category, last_index) VALUES (?, ?, ?)
+                           ON CONFLICT (year, category) DO UPDATE SET last_index = last_index + excluded.last_index''',
+                       (year, category, count))
+        cursor.execute(f"SELECT last_index FROM {cls.sequenceTable} WHERE year = ? AND category = ?",
+                       (year, category))
+        return cursor.fetchone()[0] - count + 1
+
+    @classmethod
+    def reserve(cls, db, number):
+        """
+        Marks a registration number given from outside, e.g. in an imported file, as used,
+        so that the indexes allocated afterwards do not repeat it. Numbers that are not in
+        the AAAACCMMMM format are ignored.
+
+        Args:
+            db (object): Database connection object.
+            number (str): The registration number.
+        """
+        number = str(number)
+        if len(number) != 10 or not number.isdigit():
+            return
+        db.conn.execute(f'''INSERT INTO {cls.sequenceTable} (year, category, last_index) VALUES (?, ?, ?)
+                            ON CONFLICT (year, category) DO UPDATE SET last_index = MAX(last_index, excluded.last_index)''',
+                        (int(number[:4]), int(number[4:6]), int(number[6:])))
+
+    @staticmethod
+    def format(year, category, index):
+        """
+        Formats a registration number as AAAACCMMMM.
+
+        Returns:
+            str: The registration number.
+        """
+        return f"{year:04d}{category:02d}{index:04d}"
+
     def get_next_index(self):
         """
         Retrieves the next sequential index (MMMM) based on the athlete's category.
@@ -44,23 +140,12 @@ class RegistrationNumber:
             DatabaseError: If there is an issue with the database operation.
         """
         try:
-            table_name = self.config.app_config.database_table_name
             category = self.current_year - self.birth_year
-            query = f"SELECT MAX(CAST(SUBSTR({self.columnName}, 7, 4) AS INTEGER)) FROM {table_name} WHERE CAST(SUBSTR({self.columnName}, 5, 2) AS INTEGER) = ?"
-            cursor = self.db.conn.cursor()
-            cursor.execute(query, (category,))
-            result = cursor.fetchone()
-
-            if result[0] is not None:
-                next_index = result[0] + 1
-            else:
-                next_index = 1
-
-            return next_index
+            return self.allocate(self.db, self.current_year, category)
         except sqlite3.OperationalError as e:
             raise ConnectionError(f"Failed to connect to the database: {e}")
         except sqlite3.DatabaseError as e:
-            raise DatabaseError(f"Database operation failed: {e}")
+            raise sqlite3.DatabaseError(f"Database operation failed: {e}")
 
     def generate_registration_number(self):
         """
@@ -71,7 +156,4 @@ class RegistrationNumber:
         """
         next_index = self.get_next_index()
         category = self.current_year - self.birth_year
-        return f"{self.current_year:04d}{category:02d}{next_index:04d}"
-
-
-
+        return self.format(self.current_year, category, next_index)
@@ -0,0 +1,138 @@
+import unicodedata
+
+class RowFilterIndex:
+    """
+    An in-memory text index over the rows of an AthletesTableModel, for filtering a tab.
+
+    Each row is kept as one normalized string (casefolded, without accents) with all
+    its cell values, and a trigram index maps every three-character sequence to the
+    rows that contain it. A query returns the rows that contain all its words. When
+    the query refines the previous one (the user kept typing), only the previous
+    matches are checked again; otherwise the candidates come from the trigram index.
+
+    The index follows the model through its signals.
+
+    Args:
+        model (AthletesTableModel): The model to index.
+
+    Usage:
+    >>> index = RowFilterIndex(model)
+    >>> rows = index.match('jose')      # source rows matching
+    >>> rows = index.match('jose s')    # narrowed from the previous result
+    """
+
+    # Joins the cells, so that a word never matches across two columns
+    SEPARATOR = '\x1f'
+
+    def __init__(self, model):
+        self.model = model
+        self._dirty = False
+        self._texts = []
+        self._trigrams = {}
+        self._last_query = None
+        self._last_rows = None
+
+        model.modelReset.connect(self.rebuild)
+        model.rowsInserted.connect(lambda parent, first, last: self._add_rows(first, last))
+        model.rowsRemoved.connect(lambda parent, first, last: self._invalidate())
+        model.dataChanged.connect(lambda top_left, bottom_right, roles=(): self._update_rows(top_left.row(), bottom_right.row()))
+        self.rebuild()
+
+    @staticmethod
+    def normalize(text):
+        """
+        Casefold a text and strip its accents.
+
+        Example:
+        >>> RowFilterIndex.normalize('João Ângelo')
+        'joao angelo'
+        """
+        decomposed = unicodedata.normalize('NFKD', text)
+        return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+    def _row_text(self, row):
+        return self.SEPARATOR.join(self.normalize('' if value is None else str(value))
+                                   for value in self.model.row_values(row))
+
+    @staticmethod
+    def _trigrams_of(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def rebuild(self):
+        """Index all the rows of the model again."""
+        self._dirty = False
+        self._texts = []
+        self._trigrams = {}
+        self._add_rows(0, self.model.rowCount() - 1)
+
+    def _invalidate(self):
+        # Removing rows shifts the ones after them; reindex on the next query only
+        self._dirty = True
+        self._forget_last_query()
+
+    def _add_rows(self, first, last):
+        if self._dirty:
+            return
+        if first != len(self._texts):
+            # Rows inserted before the end shift the others
+            self.rebuild()
+            return
+        for row in range(first, last + 1):
+            text = self._row_text(row)
+            self._texts.append(text)
+            for trigram in self._trigrams_of(text):
+                self._trigrams.setdefault(trigram, set()).add(row)
+        self._forget_last_query()
+
+    def _update_rows(self, first, last):
+        if self._dirty:
+            return
+        for row in range(first, last + 1):
+            for trigram in self._trigrams_of(self._texts[row]):
+                self._trigrams[trigram].discard(row)
+            text = self._row_text(row)
+            self._texts[row] = text
+            for trigram in self._trigrams_of(text):
+                self._trigrams.setdefault(trigram, set()).add(row)
+        self._forget_last_query()
+
+    def _forget_last_query(self):
+        self._last_query = None
+        self._last_rows = None
+
+    def match(self, query):
+        """
+        Find the rows that contain every word of a query.
+
+        Args:
+            query (str): The text typed by the user.
+
+        Returns:
+            set or None: The matching source rows, or None if the query is empty.
+        """
+        if self._dirty:
+            self.rebuild()
+        query = self.normalize(query).strip()
+        if not query:
+            self._forget_last_query()
+            return None
+        words = query.split()
+
+        if self._last_query is not None and query.startswith(self._last_query):
+            # A refinement only removes rows from the previous result
+            candidates = self._last_rows
+        else:
+            candidates = None
+            for word in words:
+                for trigram in self._trigrams_of(word):
+                    rows = self._trigrams.get(trigram, set())
+                    candidates = rows if candidates is None else candidates & rows
+            if candidates is None:
+                # Only words shorter than three characters
+                candidates = range(len(self._texts))
+
+        texts = self._texts
+        rows = {row for row in candidates if all(word in texts[row] for word in words)}
+        self._last_query = query
+        self._last_rows = rows
+        return rows
@@ -0,0 +1,144 @@
+import re
+import sqlite3
+
+class SearchIndex:
+    """
+    A full-text index over the athletes, stored in an SQLite FTS5 table.
+
+    The index mirrors the searchable columns of the athletes table as an external
+    content table, so the text is not stored twice; triggers on the athletes table
+    keep it in sync. Matching ignores case and accents, and every word typed is
+    matched as a prefix.
+
+    Parameters:
+        db (ConnectDB): The database connection object.
+
+    Example:
+    >>> index = SearchIndex(db)
+    >>> index.createTable('athletes')
+    >>> column_names, rows = index.search('joao sil')
+    """
+
+    # Columns of the athletes table that are indexed
+    COLUMNS = ('nome', 'nomeUsual', 'responsavelLegal', 'matricula', 'docCPF', 'docRG', 'cidade')
+
+    def __init__(self, db):
+        """
+        Initialize the SearchIndex instance.
+
+        Parameters:
+            db (ConnectDB): The database connection object.
+        """
+        self.db = db
+
+    @staticmethod
+    def table_name(owner_table):
+        """Get the name of the index of an athletes table."""
+        return f"{owner_table}_search"
+
+    def createTable(self, owner_table):
+        """
+        Create the FTS5 table and the triggers that keep it in sync, and index the
+        athletes already stored.
+
+        Parameters:
+            owner_table (str): The name of the athletes table.
+
+        Returns:
+            bool: True if the index was created, False if this SQLite has no FTS5.
+
+        Usage:
+        >>> index.createTable('athletes')
+        """
+        table = self.table_name(owner_table)
+        columns = ', '.join(self.COLUMNS)
+        new_values = ', '.join(f"NEW.{c}" for c in self.COLUMNS)
+        old_values = ', '.join(f"OLD.{c}" for c in self.COLUMNS)
+
+        try:
+            self.db.conn.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+                    {columns},
+                    content = '{owner_table}', content_rowid = 'id',
+                    tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')''')
+        except sqlite3.OperationalError as e:
+            print("Full-text search not available (%s)." % e)
+            return False
+
+        # External content: the old values are handed back to remove them from the index
+        self.db.conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_insert AFTER INSERT ON {owner_table}
+            BEGIN
+                INSERT INTO {table} (rowid, {columns}) VALUES (NEW.id, {new_values});
+            END''')
+        self.db.conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_delete AFTER DELETE ON {owner_table}
+            BEGIN
+                INSERT INTO {table} ({table}, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+            END''')
+        self.db.conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_update AFTER UPDATE OF {columns} ON {owner_table}
+            BEGIN
+                INSERT INTO {table} ({table}, rowid, {columns}) VALUES ('delete', OLD.id, {old_values});
+                INSERT INTO {table} (rowid, {columns}) VALUES (NEW.id, {new_values});
+            END''')
+        self.db.conn.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+        return True
+
+    def available(self):
+        """Returns True if the athletes table has a full-text index."""
+        row = self.db.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (self.table_name(self.db.tbName),)).fetchone()
+        return row is not None
+
+    @staticmethod
+    def match_expression(text):
+        """
+        Turn the text typed by the user into an FTS5 query.
+
+        Each word becomes a quoted prefix query and all of them must match, so
+        punctuation and FTS5 operators typed by the user are searched as text.
+
+        Parameters:
+            text (str): The text typed.
+
+        Returns:
+            str or None: The query, or None if the text has no word.
+
+        Example:
+        >>> SearchIndex.match_expression('João Sil')
+        '"João"* "Sil"*'
+        """
+        words = re.findall(r'\w+', text)
+        if not words:
+            return None
+        return ' '.join('"%s"*' % word for word in words)
+
+    def search(self, text, columns=None, limit=500):
+        """
+        Find the active athletes that match a text, across all the categories.
+
+        Parameters:
+            text (str): The text typed by the user.
+            columns (sequence, optional): The listing columns to return. Defaults to ConnectDB.SUMMARY_COLUMNS.
+            limit (int, optional): The maximum number of athletes. Defaults to 500.
+
+        Returns:
+            tuple: The list of column names and the list of rows, best matches first.
+
+        Usage:
+        >>> column_names, rows = index.search('maria')
+        """
+        owner_table = self.db.tbName
+        table = self.table_name(owner_table)
+        column_names = ['id'] + [c for c in (columns or self.db.SUMMARY_COLUMNS) if c != 'id']
+        expression = self.match_expression(text)
+        if expression is None:
+            return column_names, []
+
+        sql = f'''SELECT {', '.join(f"a.{c}" for c in column_names)}
+                  FROM {table} JOIN {owner_table} a ON a.id = {table}.rowid
+                  WHERE {table} MATCH ? AND a.{self.db.ACTIVE_CONDITION}
+                  ORDER BY {table}.rank LIMIT ?'''
+        return column_names, self.db.conn.execute(sql, (expression, limit)).fetchall()
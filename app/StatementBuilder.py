@@ -0,0 +1,129 @@
+from collections import namedtuple
+
+class Statement(namedtuple('Statement', 'sql columns')):
+    """
+    An SQL statement built by StatementBuilder and the columns of its parameters, in order.
+    """
+
+    def parameters(self, fields, *extra):
+        """
+        Get the parameters of the statement from a mapping of column values.
+
+        Parameters:
+            fields (dict): The values by column; missing columns are None.
+            *extra: Parameters appended after the column values, such as the id of an UPDATE.
+
+        Returns:
+            tuple: The parameters, in the order of the placeholders.
+        """
+        return tuple(fields.get(column) for column in self.columns) + extra
+
+class StatementBuilder:
+    """
+    Builds the INSERT and UPDATE statements of a table, validated against its columns
+    and normalized so that the same set of columns always gives the same SQL text.
+
+    The columns of a statement are put in schema order, whatever the order of the
+    fields passed, and an UPDATE sets every column of the set with COALESCE(?, column),
+    so a None value leaves the column unchanged without changing the statement. The
+    statements are built once per column set and kept; since the SQL text repeats,
+    sqlite3 also reuses its prepared statements.
+
+    Parameters:
+        table (str): The name of the table.
+        columns (list): The columns of the table, in schema order, without the id.
+
+    Example:
+    >>> statements = StatementBuilder('athletes', db.keys)
+    >>> statement = statements.update(fields)
+    >>> conn.execute(statement.sql, statement.parameters(fields, athlete_id))
+    """
+
+    def __init__(self, table, columns):
+        """
+        Initialize the StatementBuilder instance.
+
+        Parameters:
+            table (str): The name of the table.
+            columns (list): The columns of the table, in schema order, without the id.
+        """
+        self.table = table
+        self.columns = list(columns)
+        self._position = {column: i for i, column in enumerate(self.columns)}
+        self._statements = {}
+
+    def normalize(self, names):
+        """
+        Put a set of column names in schema order.
+
+        Parameters:
+            names (iterable): The column names.
+
+        Returns:
+            tuple: The names, without duplicates, in schema order.
+
+        Raises:
+            ValueError: If a column is not part of the table schema.
+        """
+        names = set(names)
+        unknown = [name for name in names if name not in self._position]
+        if unknown:
+            raise ValueError("Unknown column(s): %s" % ', '.join(sorted(unknown)))
+        return tuple(sorted(names, key=self._position.__getitem__))
+
+    def insert(self, names):
+        """
+        Get the INSERT of a set of columns.
+
+        Parameters:
+            names (iterable): The columns to insert; the others get their default value.
+
+        Returns:
+            Statement: The statement and the columns of its parameters.
+
+        Raises:
+            ValueError: If a column is not part of the table schema.
+
+        Usage:
+        >>> statement = statements.insert(fields)
+        >>> conn.execute(statement.sql, statement.parameters(fields))
+        """
+        columns = self.normalize(names)
+        key = ('insert', columns)
+        statement = self._statements.get(key)
+        if statement is None:
+            placeholders = ', '.join('?' * len(columns))
+            sql = f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES ({placeholders})"
+            statement = self._statements[key] = Statement(sql, columns)
+        return statement
+
+    def update(self, names, keep_unset=True):
+        """
+        Get the UPDATE by id of a set of columns. The id is the last parameter.
+
+        Parameters:
+            names (iterable): The columns to update.
+            keep_unset (bool, optional): Leave a column unchanged when its value is None,
+                instead of setting it to NULL. Defaults to True.
+
+        Returns:
+            Statement: The statement and the columns of its parameters.
+
+        Raises:
+            ValueError: If a column is not part of the table schema, or there is no column.
+
+        Usage:
+        >>> statement = statements.update(fields)
+        >>> conn.execute(statement.sql, statement.parameters(fields, athlete_id))
+        """
+        columns = self.normalize(names)
+        if not columns:
+            raise ValueError("No columns to update")
+        key = ('update', columns, keep_unset)
+        statement = self._statements.get(key)
+        if statement is None:
+            template = "{0} = COALESCE(?, {0})" if keep_unset else "{0} = ?"
+            set_clause = ', '.join(template.format(column) for column in columns)
+            sql = f"UPDATE {self.table} SET {set_clause} WHERE id = ?"
+            statement = self._statements[key] = Statement(sql, columns)
+        return statement
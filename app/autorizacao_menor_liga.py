@@ -7,6 +7,7 @@ from reportlab.platypus import Table, TableStyle
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.platypus import Paragraph
 from .paths import path
+from .ImageCache import ImageCache
 
 def get_image_size(image_path):
     """
@@ -33,10 +34,10 @@ def add_header(canvas, width, height):
     # Adding an image to the header
     image_path = os.path.join(path.logos,'header_liga.png')
     if os.path.exists(image_path):
-        image_width, image_height = get_image_size(image_path)
+        image_width, image_height = ImageCache.size(image_path)
         x = (width - (image_width * 0.25)) / 2
         y = height - (image_height * 0.25) - 10 
-        canvas.drawImage(image_path, x, y, image_width * 0.25, image_height * 0.25)
+        canvas.drawImage(ImageCache.get(image_path, width=image_width * 0.25), x, y, image_width * 0.25, image_height * 0.25)
     else:
         print("Image not found:", image_path)
 
@@ -6,7 +6,7 @@ import fitz  # PyMuPDF
 
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 from PyQt5 import QtWidgets, QtGui, uic
-from PyQt5.QtCore import QDateTime, QSize, QObject
+from PyQt5.QtCore import Qt, QDateTime, QSize, QObject
 from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtWidgets import QFileDialog, QFileDialog, QMessageBox, QPushButton, QInputDialog
 import sqlite3
@@ -22,8 +22,8 @@ from .ConnectDB import ConnectDB  # Import the ConnectDB class if it's in a sepa
 from .paths import path
 from .camera_application import CameraWindow
 from .RegistrationForm import RegistrationForm
-from .RegistrationNumber import RegistrationNumber
 from .BusinessLogic import BusinessLogic
+from .BackgroundLoader import BackgroundLoader
 
 class cadastroDialog(QtWidgets.QDialog):
     imagePath = None
@@ -39,6 +39,10 @@ class cadastroDialog(QtWidgets.QDialog):
         self.db = db
         self.formType = formType
         self.record_id = record_id
+        # ID of the athlete inserted or updated by this dialog, None if nothing was saved
+        self.affected_id = None
+        # Reads the athlete being edited in the background
+        self.loader = None
 
         self.initUI(formType)
         self.setupButtons(record_id)
@@ -95,12 +99,16 @@ class cadastroDialog(QtWidgets.QDialog):
         Handle the "Insert" or "Update" button press event.
         """
         isInsert = record_id is None
-        fields = self.collectFieldData(isInsert=isInsert)
+        fields = self.collectFieldData()
 
         if isInsert:
             success = self.business_logic.insert_row(**fields)
+            if success:
+                self.affected_id = success
         else:
             success = self.business_logic.update_row(record_id, **fields)
+            if success:
+                self.affected_id = int(record_id)
 
         if success:
             logging.info("Data processed successfully.")
@@ -112,17 +120,16 @@ class cadastroDialog(QtWidgets.QDialog):
         #close dialog
         self.reject()
 
-    def collectFieldData(self, isInsert=False):
+    def collectFieldData(self):
         """
         Collect data from the form fields based on the database column keys.
-        
-        Args:
-            isInsert (bool): Flag indicating if this is for an insert operation.
+
+        The registration number of a new athlete is assigned by BusinessLogic.insert_row,
+        in the transaction of the insert.
         """
         fields_data = {}
-        birth_date_str = None
 
-        for key in self.db.keys:
+        for key in self.db.keys + self.db.attachment_keys:
             if key in self.oType:
                 widget_type = self.oType[key]
                 widget = self.fields.get(key)
@@ -130,8 +137,6 @@ class cadastroDialog(QtWidgets.QDialog):
                     fields_data[key] = widget.text() if widget else ''
                 elif widget_type == 'QDateEdit':
                     date_str = widget.date().toString("dd/MM/yyyy") if widget else None
-                    if key == 'dtNascimento':
-                        birth_date_str = date_str
                     fields_data[key] = date_str
                 elif widget_type == 'QPushButton':
                     if key == 'foto' and self.imagePath:
@@ -148,12 +153,6 @@ class cadastroDialog(QtWidgets.QDialog):
                 elif widget_type in ['QRadioButton', 'QCheckBox']:
                     fields_data[key] = widget.isChecked() if widget else False
 
-        # Gerar número de matrícula para novos alunos
-        if isInsert and birth_date_str:
-            birth_year = datetime.strptime(birth_date_str, "%d/%m/%Y").year
-            registration = RegistrationNumber(self.db, self.config, birth_year, datetime.now().year)
-            fields_data['matricula'] = registration.registration_number
-
         return fields_data
 
     def readImageFile(self, imagePath):
@@ -183,7 +182,7 @@ class cadastroDialog(QtWidgets.QDialog):
         """
         Reset the form fields after insertion or update.
         """
-        for key in self.db.keys:
+        for key in self.db.keys + self.db.attachment_keys:
             if key in self.oType:
                 widget_type = self.oType[key]
                 widget = self.fields.get(key)
@@ -195,7 +194,8 @@ class cadastroDialog(QtWidgets.QDialog):
                 elif widget_type == 'QPushButton' and key == 'foto':
                     self.resetPhotoButton()
                 elif widget_type in ['QRadioButton', 'QCheckBox']:
-                    widget.setChecked(False)
+                    # New athletes are active unless unchecked
+                    widget.setChecked(key == 'is_active')
 
     def resetPhotoButton(self):
         """
@@ -318,14 +318,63 @@ class cadastroDialog(QtWidgets.QDialog):
     def setFieldsData(self, id_value):
         """
         Set the fields' data based on the provided ID.
+
+        The athlete is read in the background, so a slow database does not freeze the
+        dialog; saving is disabled until the fields are filled.
         """
-        data = self.business_logic.fetch_athlete_data(id_value)
+        def read(conn):
+            row = self.db.readById(id_value, conn=conn)
+            if row is None:
+                return []
+            # The thumbnail is enough for the button; photos stored before it existed have none
+            photo = (self.db.attachments.get(id_value, 'foto_thumb', conn=conn)
+                     or self.db.attachments.get(id_value, 'foto', conn=conn))
+            return [(row, photo)]
+
+        self.loader = BackgroundLoader(self.db, read, chunk_size=1)
+        self.loader.signals.chunkLoaded.connect(self._fieldsDataLoaded)
+        self.loader.signals.finished.connect(self._fieldsDataFinished)
+        self.loader.signals.failed.connect(self._fieldsDataFailed)
+
+        self._setLoading(True)
+        self.loader.start()
+
+    def _setLoading(self, loading):
+        """Disable saving and show a busy cursor while the athlete is being read."""
+        self.findChild(QtWidgets.QPushButton, self.formType).setEnabled(not loading)
+        if loading:
+            self.setCursor(Qt.BusyCursor)
+        else:
+            self.unsetCursor()
 
-        if not data:
+    def _fieldsDataLoaded(self, rows):
+        row, photo = rows[0]
+        self.fillFields(self.business_logic.record_fields(row))
+
+        if photo is not None and 'foto' in self.oType:
+            try:
+                self.setPhoto(Image.open(BytesIO(photo)), self.fields.get('foto'))
+            except Exception as e:
+                logging.error(f"Erro ao abrir a imagem: {e}")
+
+    def _fieldsDataFinished(self, completed):
+        self._setLoading(False)
+        if completed and self.loader.loaded == 0:
             QtWidgets.QMessageBox.warning(self, "Error", "Athlete not found.")
-            return
 
-        for key, value in data.items():
+    def _fieldsDataFailed(self, error):
+        self._setLoading(False)
+        logging.error(f"Error fetching data for athlete {self.record_id}: {error}")
+        QtWidgets.QMessageBox.warning(self, "Error", "Athlete not found.")
+
+    def fillFields(self, values):
+        """
+        Fill the widgets with the column values of an athlete.
+
+        Args:
+            values (dict): The column values, by field name.
+        """
+        for key, value in values.items():
             if key in self.oType and value is not None:
                 widget = self.fields.get(key)
                 widget_type = self.oType[key]
@@ -335,11 +384,17 @@ class cadastroDialog(QtWidgets.QDialog):
                 elif widget_type == 'QDateEdit':
                     date_obj = datetime.strptime(value, "%d/%m/%Y")
                     widget.setDateTime(date_obj)
-                elif widget_type == 'QPushButton' and key == 'foto':
-                    self.setPhoto(value, widget)
                 elif widget_type in ['QRadioButton', 'QCheckBox']:
                     widget.setChecked(bool(value))
 
+    def done(self, result):
+        """
+        Close the dialog, cancelling the read of the athlete if it is still running.
+        """
+        if self.loader is not None:
+            self.loader.cancel()
+        super().done(result)
+
     def setPhoto(self, image_data, widget):
         """
         Set the photo in the QPushButton widget.
@@ -358,9 +413,7 @@ class cadastroDialog(QtWidgets.QDialog):
         atletas_data = self.business_logic.fetch_athlete_data(athlete_id)
 
         # Create a RegistrationForm instance and generate the PDF
-        header_text = f"{self.config.app_config.nome}<br/>"
-        header_text += f"{self.config.app_config.rua}, {self.config.app_config.numero}, {self.config.app_config.cidade} - {self.config.app_config.uf}<br/>"
-        header_text += f"{self.config.app_config.fone_contato}"
+        header_text = RegistrationForm.header_from_config(self.config.app_config)
 
         # create form
         registration_form = RegistrationForm(header_text=header_text,logo=self.config.logo_file, form_filename=pdf_file_path)
@@ -470,11 +523,15 @@ class cadastroDialog(QtWidgets.QDialog):
             return
 
         for key in ['rg_pdf','atestado_pdf','autorizacao_pdf']:
+            if key not in athlete_data:
+                continue
+
             temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
             pdf_file_path = temp_pdf.name
            
+            # Stream the document straight from the database to the file
             with open(pdf_file_path, 'wb') as f:
-                f.write(athlete_data[key])
+                self.db.attachments.copy_to(athlete_id, key, f)
     
             try:
                 if sys.platform.startswith('win32'):  # Windows
@@ -10,6 +10,11 @@ from io import BytesIO
 from PIL import Image
 import yaml
 
+from .ImageCache import ImageCache
+
+# libyaml based loader when PyYAML was built with it, much faster than the pure Python one
+YamlLoader = getattr(yaml, 'CFullLoader', yaml.FullLoader)
+
 
 class FormularioPDF:
     """
@@ -374,19 +379,22 @@ class FormularioPDF:
         """
         Draw the label for the form block.
         """
-        #print(label_color, font_name, font_size, field_height)
         defaults = self.set_default_values(**kwargs)
-        
-        # Now you can access the default values for each optional argument using defaults['key']
-        
+        height = (field_blocks[-1][0] - field_blocks[0][0]) * defaults['line_height']
+        self._draw_block_frame(x, y, height, block_name, **kwargs)
+
+    def _draw_block_frame(self, x, y, height, block_name, **kwargs):
+        """
+        Draw the frame and the vertical label of a form block whose lines span the given height.
+        """
+        defaults = self.set_default_values(**kwargs)
+
         label_color = defaults['label_color']
         font_name = defaults['font_name']
         font_size = defaults['font_size']
         line_color = defaults['line_color']
-        line_height = defaults['line_height']
         field_height = defaults['field_height']
 
-        height = (field_blocks[-1][0] - field_blocks[0][0]) * line_height
         width = field_height * 0.70
         xpos = x
         ypos = y - height
@@ -404,6 +412,27 @@ class FormularioPDF:
         self.canvas.drawCentredString(0, 0, block_name)
         self.canvas.restoreState()
 
+    def draw_form_layout(self, x, y, layout, athlete_data, block_spacing, **kwargs):
+        """
+        Draws all the blocks of a compiled form layout, filled with the data of an athlete.
+
+        Args:
+            x (float): The x-coordinate of the first block.
+            y (float): The y-coordinate of the first line of the first block.
+            layout (FormLayout): The compiled layout.
+            athlete_data (dict): Data of the athlete to populate the form.
+            block_spacing (float): Distance between the tops of two consecutive blocks, in points.
+            **kwargs: Optional keyword arguments for customizing the blocks' appearance.
+        """
+        defaults = self.set_default_values(**kwargs)
+        draw_list = layout.draw_list(defaults['line_height'], defaults['field_height'], block_spacing)
+
+        for block_name, block_dy, label_height, fields in draw_list:
+            for dx, dy, width, height, label, key in fields:
+                inner_text = str(athlete_data.get(key, '')) if key else ''
+                self._draw_form_field(x + dx, y + dy, width, height, label, inner_text, **kwargs)
+            self._draw_block_frame(x, y + block_dy, label_height, block_name, **kwargs)
+
     def _draw_form_field(self, pos_x, pos_y, width, height, field_label, inner_text=None, **kwargs):
         """
         Draws a single form field, including its label and optional inner text.
@@ -560,8 +589,7 @@ class FormularioPDF:
         Returns:
             None
         """
-        image_reader = ImageReader(image_path)
-        original_width, original_height = image_reader.getSize()
+        original_width, original_height = ImageCache.size(image_path)
 
         # Calculate new size if a width percentage is provided
         if width_percentage:
@@ -570,6 +598,7 @@ class FormularioPDF:
         else:
             new_width, new_height = original_width, original_height
 
+        image_reader = ImageCache.get(image_path, width=new_width)
         self.canvas.drawImage(image_reader, x, y, width=new_width, height=new_height)
 
 
@@ -578,7 +607,7 @@ class FormularioPDF:
         Creates a formatted header in the PDF with a logo and header text aligned with the top of the logo.
         
         Args:
-            logo_path (str): The path to the logo image file.
+            logo_path (str or ImageReader): The path to the logo image file, or an already decoded image.
             header_text (str): The text to display in the header.
             **kwargs: Optional keyword arguments for customizing the header appearance.
         
@@ -608,13 +637,16 @@ class FormularioPDF:
     
         # Error handling for logo file
         try:
-            logo = ImageReader(logo_path)
+            if isinstance(logo_path, ImageReader):
+                original_logo_width, original_logo_height = logo_path.getSize()
+            else:
+                original_logo_width, original_logo_height = ImageCache.size(logo_path)
         except Exception as e:
             raise FileNotFoundError(f"Unable to find or open the logo file: {e}")
     
-        original_logo_width, original_logo_height = logo.getSize()
         logo_height = header_height
         logo_width = original_logo_width * (logo_height / original_logo_height)
+        logo = logo_path if isinstance(logo_path, ImageReader) else ImageCache.get(logo_path, height=logo_height)
         margin = 1.00 * self.cm_to_points  # Left margin
     
         # Draw the logo image, adjusting its height to the header height
@@ -680,7 +712,7 @@ class FormularioPDF:
         """
         try:
             with open(file_name, 'r') as file:
-                configuration = yaml.load(file, Loader=yaml.FullLoader)
+                configuration = yaml.load(file, Loader=YamlLoader)
                 return configuration
         except FileNotFoundError:
             print(f"The file '{file_name}' was not found.")
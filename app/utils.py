@@ -1,5 +1,7 @@
 from datetime import datetime
 
+import numpy as np
+
 # Decorator to manage routing logic based on argument types
 def overloaded_function(func):
     """
@@ -49,6 +51,57 @@ def calculate_age_category(*args, **kwargs):
     """
     pass
 
+def ages(birthdates, today=None):
+    """
+    Calculate the ages of many athletes at once.
+
+    The dates are converted to NumPy datetime64 in one pass and the ages computed with
+    array arithmetic, so no date object is created per athlete.
+
+    Parameters:
+        birthdates (sequence): Birthdates in the format "%d/%m/%Y" (e.g., "01/01/2000").
+        today (date, optional): The date the ages are calculated at. Defaults to today.
+
+    Returns:
+        numpy.ndarray: The ages, as integers, in the order of birthdates.
+
+    Raises:
+        ValueError: If a birthdate is not a valid date in the expected format.
+
+    Example:
+    >>> ages(["01/01/2000", "31/12/2010"])
+    array([23, 12])
+    """
+    born = _parse_dates(birthdates)
+    today = np.datetime64(today or datetime.today().date(), 'D')
+
+    born_year = born.astype('datetime64[Y]')
+    born_month = born.astype('datetime64[M]')
+    years = born_year.astype(int) + 1970
+    month_day = (born_month - born_year).astype(int) * 100 + (born - born_month).astype(int)
+
+    today_year = today.astype('datetime64[Y]')
+    today_month = today.astype('datetime64[M]')
+    today_month_day = (today_month - today_year).astype(int) * 100 + (today - today_month).astype(int)
+
+    return (today_year.astype(int) + 1970) - years - (today_month_day < month_day)
+
+def _parse_dates(birthdates):
+    """Convert "%d/%m/%Y" strings to a datetime64[D] array."""
+    dates = np.asarray(birthdates, dtype='U10')
+    if dates.size and np.all(np.char.str_len(dates) == 10):
+        # dd/mm/yyyy -> yyyy-mm-dd by moving the characters around
+        chars = dates.reshape(-1).view('U1').reshape(-1, 10)
+        iso = np.ascontiguousarray(chars[:, [6, 7, 8, 9, 2, 3, 4, 5, 0, 1]])
+        iso[:, [4, 7]] = '-'
+        try:
+            return iso.view('U10').reshape(dates.shape).astype('datetime64[D]')
+        except ValueError:
+            pass
+    # Dates without zero padding, or an invalid one: parse each date to find out
+    return np.array([datetime.strptime(str(born), "%d/%m/%Y").date() for born in dates.reshape(-1)],
+                    dtype='datetime64[D]').reshape(dates.shape)
+
 def age(born):
     """
     Calculate age based on the birthdate.
@@ -63,10 +116,64 @@ def age(born):
     >>> age("01/01/2000")
     23
     """
-    born = datetime.strptime(born, "%d/%m/%Y").date()
-    today = datetime.today()
-    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
-    
+    return int(ages([born])[0])
+
+def adjusted_ages(birth_years, even=None, year=None):
+    """
+    Calculate the category ages of many birth years at once.
+
+    This is the batch form of category: the age in the given year, adjusted to an even
+    number if 'even' is True, to an odd number if False, and not adjusted if None.
+
+    Parameters:
+        birth_years (sequence): The birth years, as integers.
+        even (bool, optional): The adjustment. Defaults to None.
+        year (int, optional): The reference year. Defaults to the current year.
+
+    Returns:
+        numpy.ndarray: The category ages, in the order of birth_years.
+
+    Raises:
+        ValueError: If the birth years are not integers or a birth year is after 'year'.
+    """
+    years = np.asarray(birth_years)
+    if years.size and years.dtype.kind not in 'iu':
+        raise ValueError("Birth years must be integers")
+    year = datetime.now().year if year is None else year
+
+    idade = year - years.astype(int)
+    if np.any(idade < 0):
+        raise ValueError("'year' must be greater than or equal to the birth years")
+    if even is None:
+        return idade
+
+    if even:
+        adjusted = idade + (idade % 2 != 0)  # Adjust to even
+    else:
+        adjusted = idade + (idade % 2 == 0)  # Adjust to odd
+    # Athletes born this year go into the youngest category
+    adjusted[idade == 0] = 1
+    return adjusted
+
+def categories(birth_years, even=True, year=None):
+    """
+    Determine the age categories of many birth years at once.
+
+    Parameters:
+        birth_years (sequence): The birth years, as integers (e.g., 2000).
+        even (bool, optional): If True, adjusts the ages to even numbers; if False, to odd numbers.
+        year (int, optional): The reference year. Defaults to the current year.
+
+    Returns:
+        numpy.ndarray: The category names, in the order of birth_years.
+
+    Example:
+    >>> categories([2008, 2010, 2016])
+    array(['sub-16', 'sub-14', 'initiation'], dtype='<U10')
+    """
+    idade = adjusted_ages(birth_years, even=even, year=year)
+    return np.where(idade <= 10, 'initiation', np.char.add('sub-', idade.astype(str)))
+
 def category(year, v, even=None):
     """
     Calculate an age category based on the difference between 'year' and 'v'.
@@ -93,19 +200,7 @@ def category(year, v, even=None):
     if year < v:
         raise ValueError("'year' must be greater than or equal to 'v'")
 
-    idade = year - v
-
-    # Handling the edge case where the difference is 0
-    if idade == 0:
-        return 0 if even is None else 1
-
-    # Correcting the adjustment logic
-    if even is None:
-        return idade
-    if even:
-        return idade + (idade % 2 != 0)  # Adjust to even
-    else:
-        return idade + (idade % 2 == 0)  # Adjust to odd
+    return int(adjusted_ages([v], even=even, year=year)[0])
 
 def overloaded_function(func):
     """
@@ -159,14 +254,7 @@ def getCat(dtNascimento, even=True):
     Returns:
         str: The calculated age category.
     """
-    # Using calculate_age_category to calculate the adjusted age
-    idade = calculate_age_category(datetime.now().year, dtNascimento, even=even)
-
-    # Determine the category based on age
-    if idade <= 10:
-        categoria = 'initiation'
-    else:
-        categoria = f'sub-{idade}'
-
-    return categoria
+    if not isinstance(dtNascimento, int):
+        raise ValueError("The birth year must be an integer")
+    return str(categories([dtNascimento], even=even)[0])
 
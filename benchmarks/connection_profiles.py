@@ -0,0 +1,74 @@
+"""
+Compares the SQLite connection profiles of ConnectDB on the insert and load paths.
+
+Each profile gets a fresh database in a temporary directory. Athletes are inserted
+one per transaction through BusinessLogic.insert_row, as the registration dialog
+does, and the listing is then loaded with ConnectDB.list_summary.
+
+Usage:
+    python -m benchmarks.connection_profiles [--rows 2000] [--loads 20] [--dir /path/on/target/disk]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+from app.ConnectDB import ConnectDB
+from app.BusinessLogic import BusinessLogic
+
+
+def athlete(i):
+    return {
+        'nome': f'Atleta {i:05d}',
+        'dtNascimento': f'{1 + i % 28:02d}/{1 + i % 12:02d}/{2005 + i % 12}',
+        'matricula': f'{2024:04d}{i % 12:02d}{i:04d}',
+        'foneContato': '11999990000',
+        'cidade': 'São Paulo',
+    }
+
+
+def run(profile, rows, loads, directory):
+    db_file = os.path.join(directory, f'{profile}.db')
+    with contextlib.redirect_stdout(None):
+        db = ConnectDB(db_file, profile=profile)
+        db.createTable('athletes')
+    logic = BusinessLogic(db)
+
+    start = time.perf_counter()
+    for i in range(rows):
+        logic.insert_row(**athlete(i))
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(loads):
+        db.list_summary()
+    load_time = (time.perf_counter() - start) / loads
+
+    with contextlib.redirect_stdout(None):
+        db.close_db()
+    return insert_time, load_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000, help='athletes inserted, one commit each')
+    parser.add_argument('--loads', type=int, default=20, help='listing loads averaged')
+    parser.add_argument('--dir', help='directory for the databases; use the disk the club database lives on')
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(dir=args.dir)
+    try:
+        print(f"{'profile':<12} {'insert total':>14} {'per insert':>12} {'load':>10}")
+        for profile in ConnectDB.CONNECTION_PROFILES:
+            insert_time, load_time = run(profile, args.rows, args.loads, directory)
+            print(f"{profile:<12} {insert_time:>12.3f} s {insert_time / args.rows * 1000:>9.3f} ms {load_time * 1000:>7.2f} ms")
+    finally:
+        shutil.rmtree(directory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Compares building the insert and update SQL per call with the StatementBuilder statements.
+
+Each mode gets a fresh database in a temporary directory. Athletes are inserted
+and then updated in batches of one transaction each, with the fields of the
+registration dialog; on update a random subset of the fields is None, as when
+the user leaves them unchanged. The "per call" mode builds the SQL the way
+BusinessLogic did before, skipping the None fields on update, so the statement
+text varies with the fields left empty.
+
+Usage:
+    python -m benchmarks.statement_builder [--rows 5000] [--fields 25] [--dir /path/on/target/disk]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+from app.ConnectDB import ConnectDB
+
+
+def athlete(i, columns):
+    fields = {column: f'{column} {i}' for column in columns}
+    fields.update({
+        'nome': f'Atleta {i:05d}',
+        'dtNascimento': f'{1 + i % 28:02d}/{1 + i % 12:02d}/{2005 + i % 12}',
+        'matricula': f'{2024:04d}{i % 12:02d}{i:04d}',
+    })
+    return fields
+
+
+def changes(i, columns, rng):
+    """The fields of an update; about half of them are None, that is unchanged."""
+    return {column: (f'{column} {i}*' if rng.random() < 0.5 else None) for column in columns}
+
+
+def per_call(conn, table, inserts, updates):
+    """The SQL built from the fields of each call, as BusinessLogic did before StatementBuilder."""
+    for fields in inserts:
+        columns = ','.join(fields.keys())
+        placeholders = ','.join(['?' for _ in fields])
+        conn.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", tuple(fields.values()))
+    for row_id, fields in updates:
+        columns = ','.join([f"{col} = ?" for col in fields.keys() if fields[col] is not None])
+        values = [fields[col] for col in fields.keys() if fields[col] is not None]
+        values.append(row_id)
+        if columns:
+            conn.execute(f"UPDATE {table} SET {columns} WHERE id = ?", values)
+
+
+def builder(conn, statements, inserts, updates):
+    """The canonical statements of StatementBuilder."""
+    for fields in inserts:
+        statement = statements.insert(fields)
+        conn.execute(statement.sql, statement.parameters(fields))
+    for row_id, fields in updates:
+        statement = statements.update(fields)
+        conn.execute(statement.sql, statement.parameters(fields, row_id))
+
+
+def run(mode, rows, fields, directory):
+    db_file = os.path.join(directory, f'{mode}.db')
+    with contextlib.redirect_stdout(None):
+        db = ConnectDB(db_file)
+        db.createTable('athletes')
+
+    # The text columns of the schema, as the dialog sends them
+    excluded = {'nome', 'dtNascimento', 'matricula', 'is_active', 'has_uniform'}
+    columns = [key for key in db.keys if key not in excluded][:fields]
+    rng = random.Random(0)
+    inserts = [athlete(i, columns) for i in range(rows)]
+    updates = [(i + 1, changes(i, columns, rng)) for i in range(rows)]
+
+    start = time.perf_counter()
+    with db.transaction() as conn:
+        if mode == 'per call':
+            per_call(conn, db.tbName, inserts, [])
+        else:
+            builder(conn, db.statements, inserts, [])
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with db.transaction() as conn:
+        if mode == 'per call':
+            per_call(conn, db.tbName, [], updates)
+        else:
+            builder(conn, db.statements, [], updates)
+    update_time = time.perf_counter() - start
+
+    with contextlib.redirect_stdout(None):
+        db.close_db()
+    return insert_time, update_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000, help='athletes inserted, then updated')
+    parser.add_argument('--fields', type=int, default=25, help='fields per update besides name and dates')
+    parser.add_argument('--dir', help='directory for the databases; use the disk the club database lives on')
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(dir=args.dir)
+    try:
+        print(f"{'mode':<12} {'insert':>10} {'per row':>10} {'update':>10} {'per row':>10}")
+        for mode in ('per call', 'builder'):
+            insert_time, update_time = run(mode, args.rows, args.fields, directory)
+            print(f"{mode:<12} {insert_time:>8.3f} s {insert_time / args.rows * 1e6:>7.1f} us"
+                  f" {update_time:>8.3f} s {update_time / args.rows * 1e6:>7.1f} us")
+    finally:
+        shutil.rmtree(directory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
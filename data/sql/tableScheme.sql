@@ -31,13 +31,7 @@ docRNMaeCPF VARCHAR(11) ,
 docRNPai TEXT ,
 docRNPaiRG VARCHAR(11) ,
 docRNPaiCPF VARCHAR(11) ,
-foto BLOB,
 is_active BOOLEAN  DEFAULT 1,
 has_uniform BOOLEAN  DEFAULT 0,
 RGResponsavel VARCHAR(11),
-CPFResponsavel VARCHAR(11),
-rg_pdf BLOB,
-atestado_pdf BLOB,
-autorizacao_pdf BLOB
-
-
+CPFResponsavel VARCHAR(11)